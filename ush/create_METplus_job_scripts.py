@@ -996,6 +996,9 @@ def create_job_script_step2(sdate, edate, model_list, type_list, case):
                         "export stat_analysis_obtype='"
                         +', '.join(stat_analysis_obtype_list)+"'\n"
                     )
+                if MPMD == 'YES':
+                    job_file.write('export prune_nproc="1"\n')
+                    job_file.write('export ci_nproc="1"\n')
                 job_file.write('\n')
                 job_file.write('python '
                                +os.path.join(USHverif_global,
@@ -1599,6 +1602,8 @@ def create_job_script_maps2d(sdate, edate, model_list, type_list):
                         job_file.write('export '+name+'="'+value+'"\n')
                     for name, value in extra_env_info.items():
                         job_file.write('export '+name+'="'+value+'"\n')
+                    if MPMD == 'YES':
+                        job_file.write('export plot_nproc="1"\n')
                     job_file.write('\n')
                     job_file.write(
                         'python '
@@ -1826,6 +1831,8 @@ def create_job_script_mapsda(sdate, edate, model_list, type_list):
                         job_file.write('export '+name+'="'+value+'"\n')
                     for name, value in extra_env_info.items():
                         job_file.write('export '+name+'="'+value+'"\n')
+                    if MPMD == 'YES':
+                        job_file.write('export plot_nproc="1"\n')
                     job_file.write('\n')
                     if type == 'gdas':
                         job_file.write(
@@ -14,10 +14,10 @@ Condition codes: 0 for success, 1 for failure
 
 from __future__ import (print_function, division)
 
-import numpy as np
 import logging
 import os
 import sys
+import json
 import met_util as util
 import re
 import csv
@@ -33,6 +33,9 @@ class MakePlotsWrapper(CommandBuilder):
         super(MakePlotsWrapper, self).__init__(config, logger)
         self.app_path = 'python'
         self.app_name = 'make_plots'
+        self.plot_batch = False
+        self.plot_batch_specs = []
+        self.plot_batch_base_env = dict(self.env)
 
     def set_plotting_script(self, plotting_script_path):
         self.plotting_script = plotting_script_path
@@ -51,6 +54,63 @@ class MakePlotsWrapper(CommandBuilder):
 
         return cmd
 
+    def run_plotting_script(self):
+        """! Run the plotting script with the current environment
+             variables, or add it to the plot batch when running
+             the plots in batch mode
+
+             Args:
+
+             Returns:
+        """
+        if self.plot_batch:
+            plot_env = {}
+            for key, value in self.env.items():
+                if self.plot_batch_base_env.get(key) != value:
+                    plot_env[key] = value
+            self.plot_batch_specs.append(
+                {'plotting_script': self.plotting_script,
+                 'env': plot_env}
+            )
+        else:
+            self.build()
+        self.clear()
+
+    def run_plot_batch(self, plotting_scripts_dir, plot_batch_spec_file):
+        """! Render all the plots collected in the plot batch
+             in one Python process
+
+             Args:
+                plotting_scripts_dir - string of the directory
+                                       with the plotting scripts
+                plot_batch_spec_file - string of the JSON file to
+                                       write the plot specifications
+                                       to
+
+             Returns:
+        """
+        if len(self.plot_batch_specs) == 0:
+            return
+        tmp_spec_file = plot_batch_spec_file+'.tmp'+str(os.getpid())
+        with open(tmp_spec_file, 'w') as spec_file:
+            json.dump(self.plot_batch_specs, spec_file)
+        os.rename(tmp_spec_file, plot_batch_spec_file)
+        self.logger.info("Running "+str(len(self.plot_batch_specs))
+                         +" plotting jobs in batch with "
+                         +plot_batch_spec_file)
+        returncode = subprocess.call(
+            [self.app_path,
+             os.path.join(plotting_scripts_dir, "plot_batch.py"),
+             plot_batch_spec_file],
+            env=self.env
+        )
+        if returncode != 0:
+            self.logger.error("Not all plotting jobs in "
+                              +plot_batch_spec_file+" ran successfully, "
+                              +"see the plot_batch.py errors and plot "
+                              +"specifications written to stderr")
+        self.plot_batch_specs = []
+
 
     def create_hour_group_list(self, loop_hour_beg, loop_hour_end,
                                loop_hour_interval):
@@ -287,10 +347,9 @@ class MakePlotsWrapper(CommandBuilder):
                                      +"_init"+init_time_info[0]+"to"+init_time_info[-1]+"Z")
             if not os.path.exists(randx_dir):
                 os.makedirs(randx_dir)
-            for model in os.environ['MODEL_PLOT_NAME_LIST'].split(' '):
-                randx_file = os.path.join(randx_dir, model+'_randx.txt')
-                randx = np.random.rand(ntests, total_days)
-                np.savetxt(randx_file, randx, fmt='%0.10f')
+            nmodels = len(os.environ['MODEL_PLOT_NAME_LIST'].split(' '))
+            plot_util.write_randx(plot_util.get_randx_filename(randx_dir),
+                                  nmodels, ntests, total_days)
         self.add_env_var('LEAD_LIST', ', '.join(lead_list))
         self.add_env_var('FCST_VAR_THRESH_LIST', ', '.join(fcst_var_thresh_list))	
         self.add_env_var('OBS_VAR_THRESH_LIST', ', '.join(obs_var_thresh_list))
@@ -323,8 +382,7 @@ class MakePlotsWrapper(CommandBuilder):
                     if cmd is None:
                         self.logger.error("ERROR: make_plots could not generate command for "+self.plotting_script)
                         return
-                    self.build()
-                    self.clear()
+                    self.run_plotting_script()
         #lead mean plot
         for vl in range(len(fcst_var_level_list)):
             self.add_env_var('FCST_VAR_LEVEL', fcst_var_level_list[vl])
@@ -352,8 +410,7 @@ class MakePlotsWrapper(CommandBuilder):
                 if cmd is None:
                     self.logger.error("ERROR: make_plots could not generate command for "+self.plotting_script)
                     return
-                self.build()
-                self.clear()
+                self.run_plotting_script()
         #threshold mean plot
         for lead in lead_list:
             self.add_env_var('LEAD', lead)
@@ -380,8 +437,7 @@ class MakePlotsWrapper(CommandBuilder):
                 if cmd is None:
                     self.logger.error("ERROR: make_plots could not generate command for "+self.plotting_script)
                     return
-                self.build()
-                self.clear()
+                self.run_plotting_script()
         #threshhold by mean plot
         for vl in range(len(fcst_var_level_list)):
             self.add_env_var('FCST_VAR_LEVEL', fcst_var_level_list[vl])
@@ -406,8 +462,7 @@ class MakePlotsWrapper(CommandBuilder):
             if cmd is None:
                 self.logger.error("ERROR: make_plots could not generate command for "+self.plotting_script)
                 return
-            self.build()
-            self.clear()
+            self.run_plotting_script()
 
        
  
@@ -443,8 +498,30 @@ class MakePlotsWrapper(CommandBuilder):
         plotting_scripts_dir = self.config.getdir('PLOTTING_SCRIPTS_DIR')
         plot_stats_list = self.config.getstr('config', 'PLOT_STATS_LIST')
         ci_method = self.config.getstr('config', 'CI_METHOD')
+        # MPMD job scripts export ci_nproc="1", which takes precedence
+        ci_nproc = os.environ.get(
+            'ci_nproc',
+            self.config.getstr('config', 'CI_NPROC',
+                               os.environ.get('nproc', '1'))
+        )
         verif_grid = self.config.getstr('config', 'VERIF_GRID')
         event_equalization = self.config.getstr('config', 'EVENT_EQUALIZATION', "True")
+        self.plot_batch = self.config.getbool('config', 'MAKE_PLOTS_BATCH', False)
+        # keep the cache outside PLOTTING_OUT_DIR_FULL, which is
+        # removed every run
+        stat_files_cache_dir = self.config.getstr(
+            'config', 'STAT_FILES_CACHE_DIR',
+            os.path.join(plotting_out_dir, "stat_file_cache")
+        )
+        stat_files_cache_incremental = self.config.getbool(
+            'config', 'STAT_FILES_CACHE_INCREMENTAL', False
+        )
+        stat_files_cache_max_age_days = float(self.config.getstr(
+            'config', 'STAT_FILES_CACHE_MAX_AGE_DAYS', "7"
+        ))
+        stat_files_cache_max_size_mb = float(self.config.getstr(
+            'config', 'STAT_FILES_CACHE_MAX_SIZE_MB', "1024"
+        ))
         var_list = self.parse_vars_with_level_thresh_list()
         fourier_decom_list = self.parse_var_fourier_decomp()
         region_list = util.getlist(self.config.getstr('config', 'REGION_LIST'))
@@ -465,11 +542,15 @@ class MakePlotsWrapper(CommandBuilder):
             self.logger.error("Invalid entry for PLOT_TIME, use 'valid' or 'init'")
             exit(1)
         self.add_env_var('STAT_FILES_INPUT_DIR', stat_files_input_dir)
+        self.add_env_var('STAT_FILES_CACHE_DIR', stat_files_cache_dir)
+        self.add_env_var('STAT_FILES_CACHE_INCREMENTAL',
+                         str(stat_files_cache_incremental))
         self.add_env_var('PLOTTING_OUT_DIR', plotting_out_dir)
         self.add_env_var('PLOT_STATS_LIST', plot_stats_list)
         self.add_env_var('MODEL_NAME_LIST', model_name_str_list)
         self.add_env_var('MODEL_PLOT_NAME_LIST', model_plot_name_str_list)
         self.add_env_var('CI_METHOD', ci_method)
+        self.add_env_var('CI_NPROC', ci_nproc)
         self.add_env_var('VERIF_GRID', verif_grid)
         self.add_env_var('EVENT_EQUALIZATION', event_equalization)
         self.add_env_var('LOGGING_FILENAME', logging_filename)
@@ -481,6 +562,9 @@ class MakePlotsWrapper(CommandBuilder):
         util.mkdir_p(os.path.join(plotting_out_dir_full, "imgs"))
         util.mkdir_p(os.path.join(plotting_out_dir_full, "data"))
         self.add_env_var('PLOTTING_OUT_DIR_FULL', plotting_out_dir_full)
+        plot_util.clean_stat_file_cache(self.logger, stat_files_cache_dir,
+                                        stat_files_cache_max_age_days,
+                                        stat_files_cache_max_size_mb)
         with open(met_base+'/version.txt') as met_version_txt:  
             met_version_line = met_version_txt.readline()
             met_version = float(met_version_line.strip('\n').partition('/met-')[2].partition('_')[0])
@@ -537,6 +621,10 @@ class MakePlotsWrapper(CommandBuilder):
                             self.create_plots_precip(fcst_var_level_list, obs_var_level_list,
                                                      fcst_var_thresh_list, obs_var_thresh_list,
                                                      lead_list, plotting_scripts_dir)
+        if self.plot_batch:
+            self.run_plot_batch(plotting_scripts_dir,
+                                os.path.join(plotting_out_dir_full, "data",
+                                             "plot_batch_specs.json"))
 
     def run_all_times(self):
         verif_case = self.config.getstr('config', 'VERIF_CASE')
@@ -1,4 +1,9 @@
+import os
+import copy
+import collections
+import multiprocessing
 import numpy as np
+import netCDF4 as netcdf
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
@@ -38,6 +43,151 @@ def get_obs_subplot_title(obtype, use_monthly_mean):
             obs_subplot_title = 'CERES Climo.'
     return obs_subplot_title
 
+# Number of area average weights kept in AREA_AVERAGE_WEIGHTS_CACHE
+AREA_AVERAGE_WEIGHTS_CACHE_SIZE = 16
+
+# Area average weights already calculated, least recently used first,
+# keyed by the latitude and longitude arrays' shape, start and spacing
+# and the bounds of the area
+AREA_AVERAGE_WEIGHTS_CACHE = collections.OrderedDict()
+
+def get_gridbox_edge_lat_sum(lat, lat_edge, lat_min, lat_max):
+    """! Get the sum of each latitude and the latitude of one
+         edge of its grid box, with the edge kept between the
+         poles and inside the area in the same order as the
+         clipping in GrADS aave. As in the scalar math of the
+         point by point loop, the sum is taken in the precision
+         of the latitudes when the edge is not clipped, and in
+         float64 against the clipped bound when it is.
+
+             Args:
+                 lat          - array of latitude values
+                 lat_edge     - array of the latitude values one
+                                grid spacing north or south
+                 lat_max      - float of maximum latitude
+                                to include in averaging
+                 lat_min      - float of minimum latitude
+                                to include in averaging
+
+             Returns:
+                 lat_sum      - float64 array of the sums of the
+                                latitudes and the edge latitudes
+    """
+    lat_edge_clipped = lat_edge.astype(np.float64)
+    clipped = np.zeros(lat_edge.shape, dtype=bool)
+    for bound, clip_below in [(-90, True), (lat_min, True),
+                              (90, False), (lat_max, False)]:
+        if clip_below:
+            clip = lat_edge_clipped < bound
+        else:
+            clip = lat_edge_clipped > bound
+        lat_edge_clipped = np.where(clip, np.float64(bound),
+                                    lat_edge_clipped)
+        clipped = clipped | clip
+    lat_sum = np.where(clipped,
+                       lat.astype(np.float64) + lat_edge_clipped,
+                       (lat + lat_edge).astype(np.float64))
+    return lat_sum
+
+def calculate_area_average_weights(lat, lon, lat_min, lat_max,
+                                   lon_min, lon_max):
+    """! Calculate the grid point weights used to calculate area
+         averages, weighting in the latitude dimension by the
+         difference between the sines of the latitude at the
+         northern and southern edges of the grid box, and by the
+         longitude spacing for longitudes in the area
+
+             Args:
+                 lat          - array of latitude values
+                 lon          - array of longitude values
+                 lat_max      - float of maximum latitude
+                                to include in averaging
+                 lat_min      - float of minimum latitude
+                                to include in averaging
+                 lon_max      - float of maximum longitude
+                                to include in averaging
+                 lon_min      - float of minimum longitude
+                                to include in averaging
+
+             Returns:
+                 weights      - array of the weights, number
+                                of latitudes by number of
+                                longitudes
+    """
+    lat = np.asarray(lat)
+    lon = np.asarray(lon)
+    dlat = np.diff(lat)[0]
+    dlon = np.diff(lon)[0]
+    # Compare and take the sines in float64 like the scalar math
+    # of the point by point loop this replaced, so float32 grids
+    # get the same weights as before
+    lat64 = lat.astype(np.float64)
+    lon64 = lon.astype(np.float64)
+    lat_gridbox_top = get_gridbox_edge_lat_sum(lat, lat + dlat,
+                                               lat_min, lat_max)/2.
+    lat_gridbox_bottom = get_gridbox_edge_lat_sum(lat, lat - dlat,
+                                                  lat_min, lat_max)/2.
+    weight1 = (
+        np.sin(np.deg2rad(lat_gridbox_top))
+        - np.sin(np.deg2rad(lat_gridbox_bottom))
+    )
+    weight1 = np.where((lat64 == -90) | (lat64 == 90)
+                       | (lat64 < lat_min) | (lat64 > lat_max),
+                       0, weight1)
+    weight2 = np.where((lon64 < lon_min) | (lon64 > lon_max),
+                       0, np.float64(dlon))
+    weights = weight1[:,None] * weight2[None,:]
+    return weights
+
+def get_area_average_weights(lat, lon, lat_min, lat_max,
+                             lon_min, lon_max):
+    """! Get the grid point weights used to calculate area
+         averages, calculating them only the first time a grid
+         and area is asked for
+
+             Args:
+                 lat          - array of latitude values
+                 lon          - array of longitude values
+                 lat_max      - float of maximum latitude
+                                to include in averaging
+                 lat_min      - float of minimum latitude
+                                to include in averaging
+                 lon_max      - float of maximum longitude
+                                to include in averaging
+                 lon_min      - float of minimum longitude
+                                to include in averaging
+
+             Returns:
+                 weights      - read-only array of the weights,
+                                number of latitudes by number
+                                of longitudes
+    """
+    lat = np.asarray(lat)
+    lon = np.asarray(lon)
+    weights_key = (lat.shape, lat.dtype.str, lat.flat[0], np.diff(lat)[0],
+                   lon.shape, lon.dtype.str, lon.flat[0], np.diff(lon)[0],
+                   lat_min, lat_max, lon_min, lon_max)
+    if weights_key in AREA_AVERAGE_WEIGHTS_CACHE:
+        cached_lat, cached_lon, weights = (
+            AREA_AVERAGE_WEIGHTS_CACHE.pop(weights_key)
+        )
+        # Irregular grids, e.g. Gaussian, can share a start and
+        # spacing, so check the coordinates match too
+        if np.array_equal(lat, cached_lat) \
+                and np.array_equal(lon, cached_lon):
+            AREA_AVERAGE_WEIGHTS_CACHE[weights_key] = (
+                cached_lat, cached_lon, weights
+            )
+            return weights
+    weights = calculate_area_average_weights(lat, lon, lat_min, lat_max,
+                                             lon_min, lon_max)
+    weights.flags.writeable = False
+    AREA_AVERAGE_WEIGHTS_CACHE[weights_key] = (lat.copy(), lon.copy(),
+                                               weights)
+    while len(AREA_AVERAGE_WEIGHTS_CACHE) > AREA_AVERAGE_WEIGHTS_CACHE_SIZE:
+        AREA_AVERAGE_WEIGHTS_CACHE.popitem(last=False)
+    return weights
+
 def calculate_area_average(var_data, lat, lon, lat_min, lat_max,
                            lon_min, lon_max):
     """! Calculate area average of dataset,
@@ -47,7 +197,11 @@ def calculate_area_average(var_data, lat, lon, lat_min, lat_max,
          GrADS function aave.
         
              Args:
-                 var_data     - array of variable values
+                 var_data     - array of variable values, number
+                                of latitudes by number of
+                                longitudes, or a stack of them
+                                with the latitudes and longitudes
+                                as the last two dimensions
                  lat          - array of latitude values 
                  lon          - array of longitude values
                  lat_max      - float of maximum latitude
@@ -60,60 +214,116 @@ def calculate_area_average(var_data, lat, lon, lat_min, lat_max,
                                 to include in averaging
 
              Returns:
-                 area_average - float of area average
+                 area_average - float of area average, or array
+                                of area averages for a stack
+                                of fields
     """
-    dlat = np.diff(lat)[0]
-    dlon = np.diff(lon)[0]
+    weights = get_area_average_weights(lat, lon, lat_min, lat_max,
+                                       lon_min, lon_max)
     mvar_data = np.ma.masked_invalid(var_data)
-    weightsum = 0
-    arraysum = 0
-    for y in range(len(lat)):
-        lat_mid = lat[y]
-        if lat_mid == -90 or lat_mid == 90:
-           weight1 = 0
-        elif lat_mid < lat_min or lat_mid > lat_max:
-           weight1 = 0
-        else:
-           lat_high = lat_mid + dlat
-           if lat_high < -90:
-               lat_high = -90
-           if lat_high < lat_min:
-               lat_high = lat_min
-           if lat_high > 90:
-               lat_high = 90
-           if lat_high > lat_max:
-               lat_high = lat_max
-           lat_low = lat_mid - dlat
-           if lat_low < -90:
-               lat_low = -90
-           if lat_low < lat_min:
-               lat_low = lat_min
-           if lat_low > 90:
-               lat_low = 90
-           if lat_low > lat_max:
-               lat_low = lat_max
-           lat_gridbox_top = (lat_mid + lat_high)/2.
-           lat_gridbox_bottom = (lat_mid + lat_low)/2.
-           weight1 = (
-                np.sin(np.deg2rad(lat_gridbox_top))
-                - np.sin(np.deg2rad(lat_gridbox_bottom))
-           )
-        for x in range(len(lon)):
-            if lon[x] < lon_min or lon[x] > lon_max:
-                weight2 = 0
-            else:
-                weight2 = dlon
-            if np.ma.is_masked(mvar_data[y,x]):
-                arraysum = arraysum
-                weightsum = weightsum
-            else:
-                arraysum = arraysum + (mvar_data[y,x] * (weight1 * weight2))
-                weightsum = weightsum + (weight1 * weight2)
-    if arraysum == 0 and weightsum == 0:
-        aa_avg = np.nan
+    valid = ~np.ma.getmaskarray(mvar_data)
+    # Sum in grid point order, as accumulate does not reorder
+    # the additions like sum does, so the averages match
+    # summing point by point
+    stack_shape = mvar_data.shape[:-2]
+    npoints = weights.size
+    arraysum = np.add.accumulate(
+        np.where(valid, mvar_data.filled(0) * weights, 0)
+        .reshape(stack_shape+(npoints,)),
+        axis=-1
+    )[...,-1]
+    weightsum = np.add.accumulate(
+        np.where(valid, weights, 0).reshape(stack_shape+(npoints,)),
+        axis=-1
+    )[...,-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aa_avg = np.where((arraysum == 0) & (weightsum == 0),
+                          np.nan, arraysum/weightsum)
+    return aa_avg[()]
+
+# Number of arrays kept in SERIES_ANALYSIS_DATA_CACHE
+SERIES_ANALYSIS_DATA_CACHE_SIZE = 32
+
+# Series analysis arrays already read, least recently used first,
+# keyed by the file, its modification time, the variable name
+# and the scale
+SERIES_ANALYSIS_DATA_CACHE = collections.OrderedDict()
+
+def read_series_analysis_file(series_analysis_file, var_scale,
+                              var_name_list=('series_cnt_FBAR',
+                                             'series_cnt_OBAR')):
+    """ Read variables from a series_analysis file. The file is
+        opened only if a variable has not been read before, only
+        the variables asked for are read, and the arrays are kept,
+        read-only, for later reads of the same file.
+
+            Args:
+                series_analysis_file - string of the series_analysis
+                                       file path
+                var_scale            - float to multiply the
+                                       variables by
+                var_name_list        - list of the variable names
+                                       to read
+
+            Returns:
+                series_analysis_data - tuple of the arrays of the
+                                       variables in var_name_list,
+                                       NaN where missing, then the
+                                       latitude and longitude arrays,
+                                       all read-only
+    """
+    print(series_analysis_file+" exists")
+    file_key = (os.path.abspath(series_analysis_file),
+                os.path.getmtime(series_analysis_file))
+    data_key_list = (
+        [file_key+(var_name, var_scale) for var_name in var_name_list]
+        + [file_key+('lat', 1), file_key+('lon', 1)]
+    )
+    if not all(data_key in SERIES_ANALYSIS_DATA_CACHE
+               for data_key in data_key_list):
+        series_analysis_data = netcdf.Dataset(series_analysis_file)
+        try:
+            lat = series_analysis_data.variables['lat'][:]
+            lon = series_analysis_data.variables['lon'][:]
+            read_data_dict = {'lat': lat, 'lon': lon}
+            for var_name in var_name_list:
+                if var_name in series_analysis_data.variables:
+                    var_data = (
+                        series_analysis_data.variables[var_name][:]
+                        * var_scale
+                    )
+                else:
+                    print("WARNING: "+var_name.replace('series_cnt_', '')
+                          +" values not in file "+series_analysis_file
+                          +"...setting to NaN")
+                    var_data = np.full((len(lat), len(lon)), np.nan)
+                if np.ma.is_masked(var_data):
+                    np.ma.set_fill_value(var_data, np.nan)
+                    var_data = var_data.filled()
+                read_data_dict[var_name] = var_data
+        finally:
+            series_analysis_data.close()
+        # the cached arrays are shared by later reads
+        for read_data in read_data_dict.values():
+            read_data.flags.writeable = False
+        for data_key in data_key_list:
+            SERIES_ANALYSIS_DATA_CACHE.pop(data_key, None)
+            SERIES_ANALYSIS_DATA_CACHE[data_key] = (
+                read_data_dict[data_key[2]]
+            )
+        while len(SERIES_ANALYSIS_DATA_CACHE) \
+                > SERIES_ANALYSIS_DATA_CACHE_SIZE:
+            SERIES_ANALYSIS_DATA_CACHE.popitem(last=False)
+        series_analysis_data = tuple(read_data_dict[data_key[2]]
+                                     for data_key in data_key_list)
     else:
-        aa_avg = arraysum/weightsum
-    return aa_avg
+        for data_key in data_key_list:
+            SERIES_ANALYSIS_DATA_CACHE[data_key] = (
+                SERIES_ANALYSIS_DATA_CACHE.pop(data_key)
+            )
+        series_analysis_data = tuple(SERIES_ANALYSIS_DATA_CACHE[data_key]
+                                     for data_key in data_key_list)
+    return series_analysis_data
 
 def get_maps2d_plot_settings(var_name, var_level):
     """! Get plot settings specific for variable name and level
@@ -1340,3 +1550,164 @@ def get_maps2d_plot_settings(var_name, var_level):
         )
     return (var_info_title, levels, levels_diff, cmap, var_scale,
             formal_var_name)
+
+# Map backgrounds already set up, keyed by the python map
+# plotting package and the map's bounding latitudes and longitudes
+MAP_BACKGROUND_CACHE = {}
+
+def get_map_background(py_map_pckg, latlon_area):
+    """ Get the map projection, coastlines and ticks for
+        a map area. These are built the first time the area
+        is asked for and reused for all subplots after.
+
+            Args:
+                py_map_pckg    - string of the python
+                                 map plotting package
+                                 to use; either cartopy
+                                 or basemap
+                latlon_area    - list of the bounding
+                                 latitudes and longitudes
+                                 for the map
+
+            Returns:
+                map_background - dictionary of the map
+                                 background information
+    """
+    map_background_key = (py_map_pckg, tuple(latlon_area))
+    if map_background_key in MAP_BACKGROUND_CACHE:
+        return MAP_BACKGROUND_CACHE[map_background_key]
+    llcrnrlat_val = float(latlon_area[0])
+    urcrnrlat_val = float(latlon_area[1])
+    llcrnrlon_val = float(latlon_area[2])
+    urcrnrlon_val = float(latlon_area[3])
+    map_background = {
+        'py_map_pckg': py_map_pckg,
+        'lat_ticks': np.linspace(llcrnrlat_val, urcrnrlat_val, 7,
+                                 endpoint=True),
+        'lon_ticks': np.linspace(llcrnrlon_val, urcrnrlon_val, 7,
+                                 endpoint=True)
+    }
+    if py_map_pckg == 'cartopy':
+        import cartopy.crs as ccrs
+        import cartopy.feature as cfeature
+        if urcrnrlon_val == 360:
+            urcrnrlon_val_adjust = 359.9
+        else:
+            urcrnrlon_val_adjust = urcrnrlon_val
+        map_projection = ccrs.PlateCarree(central_longitude=180)
+        # Project the coastlines into the map projection once
+        coastlines = []
+        for geom in cfeature.COASTLINE.geometries():
+            coastlines.append(
+                map_projection.project_geometry(geom,
+                                                cfeature.COASTLINE.crs)
+            )
+        map_background['projection'] = map_projection
+        map_background['data_crs'] = ccrs.PlateCarree()
+        map_background['extent'] = [llcrnrlon_val, urcrnrlon_val_adjust,
+                                    llcrnrlat_val, urcrnrlat_val]
+        map_background['coastlines'] = coastlines
+        map_background['subplot_kwargs'] = {'projection': map_projection}
+    elif py_map_pckg == 'basemap':
+        from mpl_toolkits.basemap import Basemap
+        # Basemap processes the coastlines when created, so
+        # create it once and give copies of it to each subplot
+        map_background['basemap'] = Basemap(
+            projection='cyl', llcrnrlat=llcrnrlat_val,
+            urcrnrlat=urcrnrlat_val, llcrnrlon=llcrnrlon_val,
+            urcrnrlon=urcrnrlon_val, resolution='c', lon_0=180
+        )
+        map_background['subplot_kwargs'] = {}
+    MAP_BACKGROUND_CACHE[map_background_key] = map_background
+    return map_background
+
+def draw_map_background(ax_tmp, map_background):
+    """ Draw the map background on a subplot.
+
+            Args:
+                ax_tmp         - subplot axis object, made
+                                 with the map background's
+                                 subplot_kwargs
+                map_background - dictionary of the map
+                                 background information
+                                 from get_map_background
+
+            Returns:
+                map_ax_tmp     - subplot map information
+    """
+    lat_ticks = map_background['lat_ticks']
+    lon_ticks = map_background['lon_ticks']
+    if map_background['py_map_pckg'] == 'cartopy':
+        from cartopy.mpl.ticker import LongitudeFormatter, LatitudeFormatter
+        map_ax_tmp = ax_tmp
+        ax_tmp.set_extent(map_background['extent'],
+                          map_background['data_crs'])
+        ax_tmp.set_global()
+        ax_tmp.add_geometries(map_background['coastlines'],
+                              map_background['projection'],
+                              edgecolor='black', facecolor='none')
+        ax_tmp.set_xticks(lon_ticks, crs=map_background['data_crs'])
+        ax_tmp.set_yticks(lat_ticks, crs=map_background['data_crs'])
+        lon_formatter = LongitudeFormatter(zero_direction_label=True)
+        lat_formatter = LatitudeFormatter()
+        ax_tmp.xaxis.set_major_formatter(lon_formatter)
+        ax_tmp.yaxis.set_major_formatter(lat_formatter)
+    elif map_background['py_map_pckg'] == 'basemap':
+        map_ax_tmp = copy.copy(map_background['basemap'])
+        map_ax_tmp.ax = ax_tmp
+        map_ax_tmp.drawcoastlines(linewidth=1.5, color='k', zorder=6)
+        map_ax_tmp.drawmapboundary
+        map_ax_tmp.drawmeridians(lon_ticks, labels=[False,False,False,True])
+        map_ax_tmp.drawparallels(lat_ticks, labels=[True,False,False,False])
+    return map_ax_tmp
+
+def run_plot_task(plot_task):
+    """! Make one figure as a worker pool task
+
+            Args:
+                plot_task - tuple of the function that makes
+                            the figure and the tuple of its
+                            arguments
+
+            Returns:
+    """
+    plot_function, plot_args = plot_task
+    try:
+        plot_function(*plot_args)
+    except SystemExit:
+        # Exiting a pool worker would leave the pool waiting
+        raise RuntimeError("Could not make figure for "
+                           +', '.join([str(arg) for arg in plot_args]))
+    plt.close('all')
+
+def run_plot_tasks(plot_function, plot_args_list, nproc=1):
+    """! Make a figure for each set of arguments in a list,
+         with a pool of worker processes if more than one
+         process is requested. Each worker makes one figure
+         and is then replaced so memory from the figure is
+         returned, keeping memory use bounded by the number
+         of worker processes. The workers are forked, so they
+         share the already read in script data.
+
+            Args:
+                plot_function  - function that makes a figure
+                plot_args_list - list of tuples of the
+                                 plot_function arguments
+                nproc          - integer of the number of worker
+                                 processes
+
+            Returns:
+    """
+    plot_tasks = [(plot_function, plot_args)
+                  for plot_args in plot_args_list]
+    if nproc > 1 and len(plot_tasks) > 1:
+        pool = multiprocessing.Pool(min(nproc, len(plot_tasks)),
+                                    maxtasksperchild=1)
+        try:
+            pool.map(run_plot_task, plot_tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for plot_args in plot_args_list:
+            plot_function(*plot_args)
@@ -0,0 +1,228 @@
+'''
+Program Name: plot_batch.py
+Contact(s): Mallory Row
+Abstract: Renders a batch of plots in a single Python process.
+          The plotting scripts are loaded once and their
+          make_plots entry points called for each plot, so the
+          interpreter startup, the matplotlib/pandas imports and
+          the script setup are paid once per batch instead of
+          once per plot. Scripts without a make_plots entry point
+          are run in-process as __main__.
+Usage: plot_batch.py plot_batch_spec_file
+Parameters: plot_batch_spec_file - JSON file holding a list of
+                                   plot specifications, each
+                                   a dictionary with the
+                                   plotting script path and the
+                                   environment variables to run
+                                   it with
+Condition codes: 0 for success, 1 if any plot failed
+'''
+
+from __future__ import (print_function, division)
+
+import os
+import sys
+import json
+import logging
+import runpy
+import time
+import traceback
+import warnings
+try:
+    import importlib.util as importlib_util
+except ImportError:
+    importlib_util = None
+    import imp
+# Import the modules the plotting scripts use once for the batch
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('agg')
+import matplotlib.pyplot as plt
+import matplotlib.dates as md
+import plot_util as plot_util
+import plot_title as plot_title
+import plot_style as plot_style
+
+warnings.filterwarnings('ignore')
+
+
+def read_plot_batch_spec_file(plot_batch_spec_file):
+    """! Read the list of plot specifications
+
+             Args:
+                 plot_batch_spec_file - string of the JSON file
+                                        holding the plot
+                                        specifications
+
+             Returns:
+                 plot_specs           - list of dictionaries with
+                                        the plotting script path
+                                        and the environment
+                                        variables for each plot
+    """
+    with open(plot_batch_spec_file, 'r') as spec_file:
+        plot_specs = json.load(spec_file)
+    return plot_specs
+
+def report_plot_spec_failure(plot_spec, message):
+    """! Write a failed plot's message and specification to
+         stderr, which make_plots_wrapper passes on to its log;
+         the plotting script's logger may have no handler left
+         by the time the failure is caught
+
+             Args:
+                 plot_spec - dictionary with the plotting
+                             script path and the environment
+                             variables it was run with
+                 message   - string of the failure message
+
+             Returns:
+    """
+    sys.stderr.write("ERROR: "+message+"\n"
+                     +"Plot specification:\n"
+                     +json.dumps(plot_spec, indent=1, sort_keys=True)
+                     +"\n")
+    sys.stderr.flush()
+
+def load_plotting_module(plotting_script):
+    """! Import a plotting script as a module, registered in
+         sys.modules so its globals stay alive for the batch;
+         runpy.run_path cannot be used as Python 2 clears the
+         globals of the module it ran once it returns
+
+             Args:
+                 plotting_script - string of the plotting script
+                                   path
+
+             Returns:
+                 plotting_module - the plotting script module
+    """
+    module_name = os.path.splitext(os.path.basename(plotting_script))[0]
+    if importlib_util is not None:
+        module_spec = importlib_util.spec_from_file_location(
+            module_name, plotting_script
+        )
+        plotting_module = importlib_util.module_from_spec(module_spec)
+        sys.modules[module_name] = plotting_module
+        module_spec.loader.exec_module(plotting_module)
+    else:
+        plotting_module = imp.load_source(module_name, plotting_script)
+    return plotting_module
+
+def get_plotting_module(plotting_script, plotting_modules):
+    """! Load a plotting script as a module once per batch
+
+             Args:
+                 plotting_script  - string of the plotting script
+                                    path
+                 plotting_modules - dictionary of the already
+                                    loaded plotting modules,
+                                    keyed by script path
+
+             Returns:
+                 plotting_module  - the plotting script module,
+                                    None if the script has no
+                                    make_plots entry point and
+                                    only runs as a script
+    """
+    if plotting_script not in plotting_modules:
+        with open(plotting_script, 'r') as script_file:
+            has_make_plots = 'def make_plots(' in script_file.read()
+        if has_make_plots:
+            plotting_modules[plotting_script] = load_plotting_module(
+                plotting_script
+            )
+        else:
+            plotting_modules[plotting_script] = None
+    return plotting_modules[plotting_script]
+
+def run_plot_spec(plot_spec, plotting_modules):
+    """! Run a plotting script in-process with the
+         environment variables of its plot specification
+
+             Args:
+                 plot_spec        - dictionary with the plotting
+                                    script path and the
+                                    environment variables to run
+                                    it with
+                 plotting_modules - dictionary of the already
+                                    loaded plotting modules,
+                                    keyed by script path
+
+             Returns:
+                 success          - boolean of whether the script
+                                    ran without error
+    """
+    plotting_script = plot_spec['plotting_script']
+    os.environ.update(plot_spec['env'])
+    # Each script sets its own plot settings and adds a file
+    # handler to the logger, undo both between plots
+    logger = logging.getLogger(os.environ['LOGGING_FILENAME'])
+    logger_handlers = list(logger.handlers)
+    success = True
+    try:
+        plotting_module = get_plotting_module(plotting_script,
+                                              plotting_modules)
+        if plotting_module is not None:
+            with plot_style.style_context(
+                    getattr(plotting_module, 'plot_rcParams', {})):
+                plotting_module.make_plots(dict(os.environ))
+        else:
+            with plot_style.style_context({}):
+                runpy.run_path(plotting_script, run_name='__main__')
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            report_plot_spec_failure(
+                plot_spec, plotting_script+" exited with "+str(e.code)
+            )
+            success = False
+    except Exception:
+        report_plot_spec_failure(
+            plot_spec, plotting_script+" failed:\n"+traceback.format_exc()
+        )
+        success = False
+    finally:
+        plt.close('all')
+        for handler in list(logger.handlers):
+            if handler not in logger_handlers:
+                logger.removeHandler(handler)
+                handler.close()
+    return success
+
+def run_plot_batch(plot_specs):
+    """! Run the plotting scripts of a list of plot specifications
+         in this process
+
+             Args:
+                 plot_specs - list of dictionaries with the
+                              plotting script path and the
+                              environment variables for each plot
+
+             Returns:
+                 nfailed    - integer of the number of plots
+                              that failed
+    """
+    base_env = dict(os.environ)
+    plotting_modules = {}
+    nfailed = 0
+    for plot_spec in plot_specs:
+        os.environ.clear()
+        os.environ.update(base_env)
+        if not run_plot_spec(plot_spec, plotting_modules):
+            nfailed+=1
+    os.environ.clear()
+    os.environ.update(base_env)
+    return nfailed
+
+
+if __name__ == '__main__':
+    start_time = time.time()
+    plot_batch_spec_file = sys.argv[1]
+    plot_specs = read_plot_batch_spec_file(plot_batch_spec_file)
+    nfailed = run_plot_batch(plot_specs)
+    print("Rendered "+str(len(plot_specs)-nfailed)+" of "
+          +str(len(plot_specs))+" plot jobs in "
+          +"%.2f" % (time.time() - start_time)+" seconds")
+    if nfailed > 0:
+        exit(1)
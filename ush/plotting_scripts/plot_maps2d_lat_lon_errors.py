@@ -1,7 +1,6 @@
 from __future__ import (print_function, division)
 import os
 import numpy as np
-import netCDF4 as netcdf
 import re
 import maps2d_plot_util as maps2d_plot_util
 import warnings
@@ -10,6 +9,7 @@ import datetime
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
+import plot_style as plot_style
 import matplotlib.gridspec as gridspec
 
 warnings.filterwarnings('ignore')
@@ -32,65 +32,19 @@ plt.rcParams['figure.titleweight'] = 'bold'
 plt.rcParams['figure.titlesize'] = 16
 title_loc = 'center'
 cmap_diff = plt.cm.coolwarm_r
-noaa_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'noaa.png')
-)
+noaa_logo_img_array = plot_style.get_logo_array('noaa.png')
 noaa_logo_alpha = 0.5
-nws_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'nws.png')
-)
+nws_logo_img_array = plot_style.get_logo_array('nws.png')
 nws_logo_alpha = 0.5
 
 # Functions
-def read_series_analysis_file(series_analysis_file, var_scale):
-    print(series_analysis_file+" exists")
-    series_analysis_data = netcdf.Dataset(series_analysis_file)
-    series_analysis_data_lat = series_analysis_data.variables['lat'][:]
-    series_analysis_data_lon = series_analysis_data.variables['lon'][:]
-    series_analysis_data_variable_names = []
-    for var in series_analysis_data.variables:
-        series_analysis_data_variable_names.append(str(var))
-    if 'series_cnt_FBAR' in series_analysis_data_variable_names:
-        series_analysis_data_series_cnt_FBAR =  (
-            series_analysis_data.variables['series_cnt_FBAR'][:] * var_scale
-        )
-    else:
-        print("WARNING: FBAR values not in file "+series_analysis_file
-              +"...setting to NaN")
-        series_analysis_data_series_cnt_FBAR = np.full(
-            (len(series_analysis_data_lat), len(series_analysis_data_lon)),
-            np.nan
-        )
-    if np.ma.is_masked(series_analysis_data_series_cnt_FBAR):
-        np.ma.set_fill_value(series_analysis_data_series_cnt_FBAR, np.nan)
-        series_analysis_data_series_cnt_FBAR = (
-            series_analysis_data_series_cnt_FBAR.filled()
-        )
-    if 'series_cnt_OBAR' in series_analysis_data_variable_names:
-        series_analysis_data_series_cnt_OBAR =  (
-            series_analysis_data.variables['series_cnt_OBAR'][:] * var_scale
-        )
-    else:
-        print("WARNING: OBAR values not in file "+series_analysis_file
-              +"...setting to NaN")
-        series_analysis_data_series_cnt_OBAR = np.full(
-            (len(series_analysis_data_lat), len(series_analysis_data_lon)),
-            np.nan
-        )
-    if np.ma.is_masked(series_analysis_data_series_cnt_OBAR):
-        np.ma.set_fill_value(series_analysis_data_series_cnt_OBAR, np.nan)
-        series_analysis_data_series_cnt_OBAR = (
-            series_analysis_data_series_cnt_OBAR.filled()
-        )
-    return (series_analysis_data_series_cnt_FBAR,
-            series_analysis_data_series_cnt_OBAR,
-            series_analysis_data_lat, series_analysis_data_lon)
-
-def draw_subplot_map(subplot_num, subplot_title, nsubplots,
+def draw_subplot_map(gs, subplot_num, subplot_title, nsubplots,
                      py_map_pckg, latlon_area):
     """ Draw map for subplot.
             
             Args:
+                gs            - gridspec of the figure's
+                                subplots
                 subplot_num   - integer of the subplot
                                 location number
                 subplot_title - string of the title for
@@ -110,45 +64,11 @@ def draw_subplot_map(subplot_num, subplot_title, nsubplots,
                 ax_tmp     -    subplot axis object
                 map_ax_tmp -    subplot map information
     """
-    llcrnrlat_val = float(latlon_area[0])
-    urcrnrlat_val = float(latlon_area[1])
-    llcrnrlon_val = float(latlon_area[2])
-    urcrnrlon_val = float(latlon_area[3])
-    lat_ticks = np.linspace(llcrnrlat_val, urcrnrlat_val, 7, endpoint=True)
-    lon_ticks = np.linspace(llcrnrlon_val, urcrnrlon_val, 7, endpoint=True)
-    if py_map_pckg == 'cartopy':
-        ax_tmp = plt.subplot(
-            gs[subplot_num],
-            projection=ccrs.PlateCarree(central_longitude=180)
-        )
-        map_ax_tmp = ax_tmp
-        if urcrnrlon_val == 360:
-            urcrnrlon_val_adjust = 359.9
-        else:
-            urcrnrlon_val_adjust = urcrnrlon_val
-        ax_tmp.set_extent(
-            [llcrnrlon_val, urcrnrlon_val_adjust,
-             llcrnrlat_val, urcrnrlat_val],
-            ccrs.PlateCarree()
-        )
-        ax_tmp.set_global()
-        ax_tmp.coastlines()
-        ax_tmp.set_xticks(lon_ticks, crs=ccrs.PlateCarree())
-        ax_tmp.set_yticks(lat_ticks, crs=ccrs.PlateCarree())
-        lon_formatter = LongitudeFormatter(zero_direction_label=True)
-        lat_formatter = LatitudeFormatter()
-        ax_tmp.xaxis.set_major_formatter(lon_formatter)
-        ax_tmp.yaxis.set_major_formatter(lat_formatter)
-    elif py_map_pckg == 'basemap':
-        ax_tmp = plt.subplot(gs[subplot_num])
-        map_ax_tmp = Basemap(projection='cyl', llcrnrlat=llcrnrlat_val,
-                             urcrnrlat=urcrnrlat_val, llcrnrlon=llcrnrlon_val,
-                             urcrnrlon=urcrnrlon_val, resolution='c',
-                             lon_0=180, ax=ax_tmp)
-        map_ax_tmp.drawcoastlines(linewidth=1.5, color='k', zorder=6)
-        map_ax_tmp.drawmapboundary
-        map_ax_tmp.drawmeridians(lon_ticks, labels=[False,False,False,True])
-        map_ax_tmp.drawparallels(lat_ticks, labels=[True,False,False,False])
+    map_background = maps2d_plot_util.get_map_background(py_map_pckg,
+                                                         latlon_area)
+    ax_tmp = plt.subplot(gs[subplot_num],
+                         **map_background['subplot_kwargs'])
+    map_ax_tmp = maps2d_plot_util.draw_map_background(ax_tmp, map_background)
     if ax_tmp.is_last_row() or \
             (nsubplots % 2 != 0 and subplot_num == nsubplots - 2):
        ax_tmp.set_xlabel('Longitude')
@@ -259,95 +179,19 @@ def plot_subplot_data(ax_tmp, map_ax_tmp, plot_data, plot_data_lat,
     else:
         CF_tmp = None
     return CF_tmp
-    
-# Read in environment variables
-DATA = os.environ['DATA']
-RUN = os.environ['RUN']
-make_met_data_by = os.environ['make_met_data_by']
-plot_by = os.environ['plot_by']
-START_DATE = os.environ['START_DATE']
-END_DATE = os.environ['END_DATE']
-forecast_to_plot = os.environ['forecast_to_plot']
-hr_beg = os.environ['hr_beg']
-hr_end = os.environ['hr_end']
-hr_inc = os.environ['hr_inc']
-regrid_to_grid = os.environ['regrid_to_grid']
-latlon_area = os.environ['latlon_area'].split(' ')
-var_group_name = os.environ['var_group_name']
-var_name = os.environ['var_name']
-var_levels = os.environ['var_levels'].split(', ')
-verif_case_type = os.environ['verif_case_type']
-if verif_case_type == 'model2model':
-    forecast_anl_diff = os.environ['forecast_anl_diff']
-    if forecast_to_plot == 'anl':
-        forecast_anl_diff = 'NO'
-if verif_case_type == 'model2obs':
-   use_monthly_mean = os.environ['use_monthly_mean']
 
-# Set up information
-py_map_pckg = os.environ['py_map_pckg']
-if py_map_pckg == 'cartopy':
-    import cartopy.crs as ccrs
-    from cartopy.util import add_cyclic_point
-    from cartopy.mpl.ticker import LongitudeFormatter, LatitudeFormatter
-elif py_map_pckg == 'basemap':
-    from mpl_toolkits.basemap import Basemap, addcyclic
-env_var_model_list = []
-regex = re.compile(r'model(\d+)$')
-for key in os.environ.keys():
-    result = regex.match(key)
-    if result is not None:
-        env_var_model_list.append(result.group(0))
-env_var_model_list = sorted(env_var_model_list, key=lambda m: m[-1])
-if env_var_model_list[0] == 'model10':
-    env_var_model_list.remove(env_var_model_list[0])
-    env_var_model_list.append('model10')
-nmodels = len(env_var_model_list)
-make_met_data_by_hrs = []
-hr = int(hr_beg) * 3600
-while hr <= int(hr_end)*3600:
-    make_met_data_by_hrs.append(str(int(hr/3600)).zfill(2)+'Z')
-    hr+=int(hr_inc)
-make_met_data_by_hrs_title = ', '.join(make_met_data_by_hrs)
-if forecast_to_plot == 'anl':
-    forecast_to_plot_title = 'analysis'
-elif forecast_to_plot[0] == 'f':
-    forecast_to_plot_title = 'forecast hour '+forecast_to_plot[1:]
-elif forecast_to_plot[0] == 'd':
-    forecast_day = int(forecast_to_plot[1:])
-    forecast_day_fhr4 = forecast_day * 24
-    forecast_day_fhr3 = str(forecast_day_fhr4 - 6).zfill(2)
-    forecast_day_fhr2 = str(forecast_day_fhr4 - 12).zfill(2)
-    forecast_day_fhr1 = str(forecast_day_fhr4 - 18).zfill(2)
-    forecast_day_fhr4 = str(forecast_day_fhr4).zfill(2)
-    forecast_to_plot_title = (
-        'forecast hours '+forecast_day_fhr1+', '+forecast_day_fhr2+', '
-        +forecast_day_fhr3+', '+forecast_day_fhr4
-    )
-START_DATE_dt = datetime.datetime.strptime(START_DATE, '%Y%m%d')
-END_DATE_dt = datetime.datetime.strptime(END_DATE, '%Y%m%d')
-dates_title = (make_met_data_by.lower()+' '
-               +START_DATE_dt.strftime('%d%b%Y')+'-'
-               +END_DATE_dt.strftime('%d%b%Y'))
+def plot_var_level_lat_lon_errors(var_level, forecast_to_plot):
+    """ Make the lat-lon error plot for a variable level.
 
-# Get input and output directories
-series_analysis_file_dir = os.path.join(DATA, RUN, 'metplus_output',
-                                        'make_met_data_by_'+make_met_data_by,
-                                        'series_analysis', verif_case_type,
-                                        var_group_name)
-plotting_out_dir_imgs = os.path.join(DATA, RUN, 'metplus_output',
-                                     'plot_by_'+plot_by,
-                                     verif_case_type, var_group_name,
-                                     'imgs')
-if not os.path.exists(plotting_out_dir_imgs):
-    os.makedirs(plotting_out_dir_imgs)
+            Args:
+                var_level        - string of the variable level
+                forecast_to_plot - string of the forecast to plot
 
-# Loop of variables levels to create
-# indivdual level lat-lon plots
-for var_level in var_levels:
+           Returns:
+    """
     # Do not plot obs. only DSWRF at toa
     if var_name == 'DSWRF' and var_level == 'toa':
-        continue
+        return
     var_info_title, levels, levels_diff, cmap, var_scale, cbar00_title = (
         maps2d_plot_util.get_maps2d_plot_settings(var_name, var_level) 
     )
@@ -477,7 +321,7 @@ for var_level in var_levels:
                     model_obtype, use_monthly_mean
                 ) 
                 ax_obs, map_ax_obs = draw_subplot_map(
-                    obs_subplot_num, obs_subplot_title, nsubplots,
+                    gs, obs_subplot_num, obs_subplot_title, nsubplots,
                     py_map_pckg, latlon_area
                 )
         # Set up analysis subplot map and title, if needed
@@ -485,8 +329,8 @@ for var_level in var_levels:
             anl_subplot_num = (2 * (model_num - 1) + 1)
             anl_subplot_title = model_plot_name+'-'+model_obtype
             ax_anl, map_ax_anl = draw_subplot_map(
-                anl_subplot_num, anl_subplot_title, nsubplots, py_map_pckg,
-                latlon_area
+                gs, anl_subplot_num, anl_subplot_title, nsubplots,
+                py_map_pckg, latlon_area
             )
         # Set up model subplot map and title
         if verif_case_type == 'model2obs':
@@ -504,7 +348,8 @@ for var_level in var_levels:
             else:
                 subplot_title = model_plot_name+'-'+model1_plot_name
         ax, map_ax = draw_subplot_map(
-            subplot_num, subplot_title, nsubplots, py_map_pckg, latlon_area
+            gs, subplot_num, subplot_title, nsubplots, py_map_pckg,
+            latlon_area
         )
         if verif_case_type == 'model2model' and model_num == 1:
             ax_model1 = ax
@@ -521,8 +366,9 @@ for var_level in var_levels:
         else:
             (model_data_series_cnt_FBAR, model_data_series_cnt_OBAR,
              model_data_lat, model_data_lon) = (
-                read_series_analysis_file(model_series_analysis_netcdf_file,
-                                          var_scale)
+                maps2d_plot_util.read_series_analysis_file(
+                    model_series_analysis_netcdf_file, var_scale
+                )
             )
             if verif_case_type == 'model2obs':
                 if model_num == 1:
@@ -690,3 +536,97 @@ for var_level in var_levels:
     print("Saving image as "+savefig_name)
     plt.savefig(savefig_name)
     plt.close()
+
+# Read in environment variables
+DATA = os.environ['DATA']
+RUN = os.environ['RUN']
+make_met_data_by = os.environ['make_met_data_by']
+plot_by = os.environ['plot_by']
+START_DATE = os.environ['START_DATE']
+END_DATE = os.environ['END_DATE']
+forecast_to_plot = os.environ['forecast_to_plot']
+hr_beg = os.environ['hr_beg']
+hr_end = os.environ['hr_end']
+hr_inc = os.environ['hr_inc']
+regrid_to_grid = os.environ['regrid_to_grid']
+latlon_area = os.environ['latlon_area'].split(' ')
+var_group_name = os.environ['var_group_name']
+var_name = os.environ['var_name']
+var_levels = os.environ['var_levels'].split(', ')
+verif_case_type = os.environ['verif_case_type']
+if verif_case_type == 'model2model':
+    forecast_anl_diff = os.environ['forecast_anl_diff']
+    if forecast_to_plot == 'anl':
+        forecast_anl_diff = 'NO'
+if verif_case_type == 'model2obs':
+   use_monthly_mean = os.environ['use_monthly_mean']
+
+# Set up information
+py_map_pckg = os.environ['py_map_pckg']
+if py_map_pckg == 'cartopy':
+    import cartopy.crs as ccrs
+    from cartopy.util import add_cyclic_point
+elif py_map_pckg == 'basemap':
+    from mpl_toolkits.basemap import addcyclic
+env_var_model_list = []
+regex = re.compile(r'model(\d+)$')
+for key in os.environ.keys():
+    result = regex.match(key)
+    if result is not None:
+        env_var_model_list.append(result.group(0))
+env_var_model_list = sorted(env_var_model_list, key=lambda m: m[-1])
+if env_var_model_list[0] == 'model10':
+    env_var_model_list.remove(env_var_model_list[0])
+    env_var_model_list.append('model10')
+nmodels = len(env_var_model_list)
+make_met_data_by_hrs = []
+hr = int(hr_beg) * 3600
+while hr <= int(hr_end)*3600:
+    make_met_data_by_hrs.append(str(int(hr/3600)).zfill(2)+'Z')
+    hr+=int(hr_inc)
+make_met_data_by_hrs_title = ', '.join(make_met_data_by_hrs)
+if forecast_to_plot == 'anl':
+    forecast_to_plot_title = 'analysis'
+elif forecast_to_plot[0] == 'f':
+    forecast_to_plot_title = 'forecast hour '+forecast_to_plot[1:]
+elif forecast_to_plot[0] == 'd':
+    forecast_day = int(forecast_to_plot[1:])
+    forecast_day_fhr4 = forecast_day * 24
+    forecast_day_fhr3 = str(forecast_day_fhr4 - 6).zfill(2)
+    forecast_day_fhr2 = str(forecast_day_fhr4 - 12).zfill(2)
+    forecast_day_fhr1 = str(forecast_day_fhr4 - 18).zfill(2)
+    forecast_day_fhr4 = str(forecast_day_fhr4).zfill(2)
+    forecast_to_plot_title = (
+        'forecast hours '+forecast_day_fhr1+', '+forecast_day_fhr2+', '
+        +forecast_day_fhr3+', '+forecast_day_fhr4
+    )
+START_DATE_dt = datetime.datetime.strptime(START_DATE, '%Y%m%d')
+END_DATE_dt = datetime.datetime.strptime(END_DATE, '%Y%m%d')
+dates_title = (make_met_data_by.lower()+' '
+               +START_DATE_dt.strftime('%d%b%Y')+'-'
+               +END_DATE_dt.strftime('%d%b%Y'))
+
+# Get input and output directories
+series_analysis_file_dir = os.path.join(DATA, RUN, 'metplus_output',
+                                        'make_met_data_by_'+make_met_data_by,
+                                        'series_analysis', verif_case_type,
+                                        var_group_name)
+plotting_out_dir_imgs = os.path.join(DATA, RUN, 'metplus_output',
+                                     'plot_by_'+plot_by,
+                                     verif_case_type, var_group_name,
+                                     'imgs')
+if not os.path.exists(plotting_out_dir_imgs):
+    os.makedirs(plotting_out_dir_imgs)
+
+# Set up the map background before making the plots
+# so the worker processes share it
+maps2d_plot_util.get_map_background(py_map_pckg, latlon_area)
+
+# Make indivdual level lat-lon plots, with a pool
+# of worker processes if requested
+plot_nproc = int(os.environ.get('plot_nproc', os.environ.get('nproc', '1')))
+maps2d_plot_util.run_plot_tasks(
+    plot_var_level_lat_lon_errors,
+    [(var_level, forecast_to_plot) for var_level in var_levels],
+    nproc=plot_nproc
+)
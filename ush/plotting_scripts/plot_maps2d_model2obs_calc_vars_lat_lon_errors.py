@@ -1,7 +1,6 @@
 from __future__ import (print_function, division)
 import os
 import numpy as np
-import netCDF4 as netcdf
 import re
 import maps2d_plot_util as maps2d_plot_util
 import warnings
@@ -10,6 +9,7 @@ import datetime
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
+import plot_style as plot_style
 import matplotlib.gridspec as gridspec
 import itertools
 
@@ -33,13 +33,9 @@ plt.rcParams['figure.titleweight'] = 'bold'
 plt.rcParams['figure.titlesize'] = 16
 title_loc = 'center'
 cmap_diff = plt.cm.coolwarm_r
-noaa_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'noaa.png')
-)
+noaa_logo_img_array = plot_style.get_logo_array('noaa.png')
 noaa_logo_alpha = 0.5
-nws_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'nws.png')
-)
+nws_logo_img_array = plot_style.get_logo_array('nws.png')
 nws_logo_alpha = 0.5
 
 # Exit early if we don't need to run this
@@ -51,50 +47,6 @@ if 'model2obs' not in type_list:
     exit()
 
 # Functions
-def read_series_analysis_file(series_analysis_file, var_scale):
-    print(series_analysis_file+" exists")
-    series_analysis_data = netcdf.Dataset(series_analysis_file)
-    series_analysis_data_lat = series_analysis_data.variables['lat'][:]
-    series_analysis_data_lon = series_analysis_data.variables['lon'][:]
-    series_analysis_data_variable_names = []
-    for var in series_analysis_data.variables:
-        series_analysis_data_variable_names.append(str(var))
-    if 'series_cnt_FBAR' in series_analysis_data_variable_names:
-        series_analysis_data_series_cnt_FBAR =  (
-            series_analysis_data.variables['series_cnt_FBAR'][:] * var_scale
-        )
-    else:
-        print("WARNING: FBAR values not in file "+series_analysis_file
-              +"...setting to NaN")
-        series_analysis_data_series_cnt_FBAR = np.full(
-            (len(series_analysis_data_lat), len(series_analysis_data_lon)),
-            np.nan
-        )
-    if np.ma.is_masked(series_analysis_data_series_cnt_FBAR):
-        np.ma.set_fill_value(series_analysis_data_series_cnt_FBAR, np.nan)
-        series_analysis_data_series_cnt_FBAR = (
-            series_analysis_data_series_cnt_FBAR.filled()
-        )
-    if 'series_cnt_OBAR' in series_analysis_data_variable_names:
-        series_analysis_data_series_cnt_OBAR =  (
-            series_analysis_data.variables['series_cnt_OBAR'][:] * var_scale
-        )
-    else:
-        print("WARNING: OBAR values not in file "+series_analysis_file
-              +"...setting to NaN")
-        series_analysis_data_series_cnt_OBAR = np.full(
-            (len(series_analysis_data_lat), len(series_analysis_data_lon)),
-            np.nan
-        )
-    if np.ma.is_masked(series_analysis_data_series_cnt_OBAR):
-        np.ma.set_fill_value(series_analysis_data_series_cnt_OBAR, np.nan)
-        series_analysis_data_series_cnt_OBAR = (
-            series_analysis_data_series_cnt_OBAR.filled()
-        )
-    return (series_analysis_data_series_cnt_FBAR,
-            series_analysis_data_series_cnt_OBAR,
-            series_analysis_data_lat, series_analysis_data_lon)
-            
 def draw_subplot_map(subplot_num, subplot_title, nsubplots,
                      py_map_pckg, latlon_area):
     """ Draw map for subplot.
@@ -119,45 +71,11 @@ def draw_subplot_map(subplot_num, subplot_title, nsubplots,
                 ax_tmp     -    subplot axis object
                 map_ax_tmp -    subplot map information
     """
-    llcrnrlat_val = float(latlon_area[0])
-    urcrnrlat_val = float(latlon_area[1])
-    llcrnrlon_val = float(latlon_area[2])
-    urcrnrlon_val = float(latlon_area[3])
-    lat_ticks = np.linspace(llcrnrlat_val, urcrnrlat_val, 7, endpoint=True)
-    lon_ticks = np.linspace(llcrnrlon_val, urcrnrlon_val, 7, endpoint=True)
-    if py_map_pckg == 'cartopy':
-        ax_tmp = plt.subplot(
-            gs[subplot_num],
-            projection=ccrs.PlateCarree(central_longitude=180)
-        )
-        map_ax_tmp = ax_tmp
-        if urcrnrlon_val == 360:
-            urcrnrlon_val_adjust = 359.9
-        else:
-            urcrnrlon_val_adjust = urcrnrlon_val
-        ax_tmp.set_extent(
-            [llcrnrlon_val, urcrnrlon_val_adjust,
-             llcrnrlat_val, urcrnrlat_val],
-            ccrs.PlateCarree()
-        )
-        ax_tmp.set_global()
-        ax_tmp.coastlines()
-        ax_tmp.set_xticks(lon_ticks, crs=ccrs.PlateCarree())
-        ax_tmp.set_yticks(lat_ticks, crs=ccrs.PlateCarree())
-        lon_formatter = LongitudeFormatter(zero_direction_label=True)
-        lat_formatter = LatitudeFormatter()
-        ax_tmp.xaxis.set_major_formatter(lon_formatter)
-        ax_tmp.yaxis.set_major_formatter(lat_formatter)
-    elif py_map_pckg == 'basemap':
-        ax_tmp = plt.subplot(gs[subplot_num])
-        map_ax_tmp = Basemap(projection='cyl', llcrnrlat=llcrnrlat_val,
-                             urcrnrlat=urcrnrlat_val, llcrnrlon=llcrnrlon_val,
-                             urcrnrlon=urcrnrlon_val, resolution='c',
-                             lon_0=180, ax=ax_tmp)
-        map_ax_tmp.drawcoastlines(linewidth=1.5, color='k', zorder=6)
-        map_ax_tmp.drawmapboundary
-        map_ax_tmp.drawmeridians(lon_ticks, labels=[False,False,False,True])
-        map_ax_tmp.drawparallels(lat_ticks, labels=[True,False,False,False])
+    map_background = maps2d_plot_util.get_map_background(py_map_pckg,
+                                                         latlon_area)
+    ax_tmp = plt.subplot(gs[subplot_num],
+                         **map_background['subplot_kwargs'])
+    map_ax_tmp = maps2d_plot_util.draw_map_background(ax_tmp, map_background)
     if ax_tmp.is_last_row() or \
             (nsubplots % 2 != 0 and subplot_num == nsubplots - 2):
        ax_tmp.set_xlabel('Longitude')
@@ -295,9 +213,8 @@ else:
 if py_map_pckg == 'cartopy':
     import cartopy.crs as ccrs
     from cartopy.util import add_cyclic_point
-    from cartopy.mpl.ticker import LongitudeFormatter, LatitudeFormatter
 elif py_map_pckg == 'basemap':
-    from mpl_toolkits.basemap import Basemap, addcyclic
+    from mpl_toolkits.basemap import addcyclic
 nmodels = int(len(model_list))
 
 # Plot title information
@@ -541,8 +458,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (DSWRF_toa_obsonly_data_series_cnt_FBAR,
                  DSWRF_toa_obsonly_data_series_cnt_OBAR,
                  DSWRF_toa_obsonly_data_lat, DSWRF_toa_obsonly_data_lon) = (
-                    read_series_analysis_file(DSWRF_toa_obsonly_file,
-                                              var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        DSWRF_toa_obsonly_file, var_scale
+                    )
                 )
                 DSWRF_sfc_file = os.path.join(
                     series_analysis_file_dir, model,
@@ -551,7 +469,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (DSWRF_sfc_data_series_cnt_FBAR,
                  DSWRF_sfc_data_series_cnt_OBAR,
                  DSWRF_sfc_data_lat, DSWRF_sfc_data_lon) = (
-                    read_series_analysis_file(DSWRF_sfc_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        DSWRF_sfc_file, var_scale
+                    )
                 )
                 USWRF_toa_file  = os.path.join(
                     series_analysis_file_dir, model,
@@ -560,7 +480,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (USWRF_toa_data_series_cnt_FBAR,
                  USWRF_toa_data_series_cnt_OBAR,
                  USWRF_toa_data_lat, USWRF_toa_data_lon) = (
-                    read_series_analysis_file(USWRF_toa_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        USWRF_toa_file, var_scale
+                    )
                 )
                 USWRF_sfc_file = os.path.join(
                     series_analysis_file_dir, model,
@@ -569,7 +491,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (USWRF_sfc_data_series_cnt_FBAR,
                  USWRF_sfc_data_series_cnt_OBAR,
                  USWRF_sfc_data_lat, USWRF_sfc_data_lon) = (
-                    read_series_analysis_file(USWRF_sfc_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        USWRF_sfc_file, var_scale
+                    )
                 )
                 obs_calc_var = (
                     DSWRF_toa_obsonly_data_series_cnt_OBAR
@@ -593,7 +517,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (DLWRF_sfc_data_series_cnt_FBAR,
                  DLWRF_sfc_data_series_cnt_OBAR,
                  DLWRF_sfc_data_lat, DLWRF_sfc_data_lon) = (
-                    read_series_analysis_file(DLWRF_sfc_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        DLWRF_sfc_file, var_scale
+                    )
                 )
                 ULWRF_toa_file  = os.path.join(
                     series_analysis_file_dir, model,
@@ -602,7 +528,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (ULWRF_toa_data_series_cnt_FBAR,
                  ULWRF_toa_data_series_cnt_OBAR,
                  ULWRF_toa_data_lat, ULWRF_toa_data_lon) = (
-                    read_series_analysis_file(ULWRF_toa_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        ULWRF_toa_file, var_scale
+                    )
                 )
                 ULWRF_sfc_file = os.path.join(
                     series_analysis_file_dir, model,
@@ -611,7 +539,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (ULWRF_sfc_data_series_cnt_FBAR,
                  ULWRF_sfc_data_series_cnt_OBAR,
                  ULWRF_sfc_data_lat, ULWRF_sfc_data_lon) = (
-                    read_series_analysis_file(ULWRF_sfc_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        ULWRF_sfc_file, var_scale
+                    )
                 )
                 obs_calc_var = (
                     DLWRF_sfc_data_series_cnt_OBAR
@@ -633,7 +563,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (DSWRF_sfc_data_series_cnt_FBAR,
                  DSWRF_sfc_data_series_cnt_OBAR,
                  DSWRF_sfc_data_series_lat, DSWRF_sfc_data_series_lon) = (
-                    read_series_analysis_file(DSWRF_sfc_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        DSWRF_sfc_file, var_scale
+                    )
                 )
                 USWRF_sfc_file = os.path.join(
                     series_analysis_file_dir, model,
@@ -642,7 +574,9 @@ for var_info_forcast_to_plot in var_info_forcast_to_plot_list:
                 (USWRF_sfc_data_series_cnt_FBAR,
                  USWRF_sfc_data_series_cnt_OBAR,
                  USWRF_sfc_data_lat, USWRF_sfc_data_lon) = (
-                    read_series_analysis_file(USWRF_sfc_file, var_scale)
+                    maps2d_plot_util.read_series_analysis_file(
+                        USWRF_sfc_file, var_scale
+                    )
                 )
                 obs_calc_var = (
                     USWRF_sfc_data_series_cnt_OBAR 
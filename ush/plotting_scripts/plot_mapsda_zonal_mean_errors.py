@@ -11,6 +11,7 @@ import datetime
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
+import plot_style as plot_style
 import matplotlib.gridspec as gridspec
 
 warnings.filterwarnings('ignore')
@@ -34,60 +35,12 @@ plt.rcParams['figure.titleweight'] = 'bold'
 plt.rcParams['figure.titlesize'] = 16
 title_loc = 'center'
 cmap_diff = plt.cm.coolwarm_r
-noaa_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'noaa.png')
-)
+noaa_logo_img_array = plot_style.get_logo_array('noaa.png')
 noaa_logo_alpha = 0.5
-nws_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'nws.png')
-)
+nws_logo_img_array = plot_style.get_logo_array('nws.png')
 nws_logo_alpha = 0.5
 
 # Functions
-def read_series_analysis_file(series_analysis_file, var_scale):
-    print(series_analysis_file+" exists")
-    series_analysis_data = netcdf.Dataset(series_analysis_file)
-    series_analysis_data_lat = series_analysis_data.variables['lat'][:]
-    series_analysis_data_lon = series_analysis_data.variables['lon'][:]
-    series_analysis_data_variable_names = []
-    for var in series_analysis_data.variables:
-        series_analysis_data_variable_names.append(str(var))
-    if 'series_cnt_FBAR' in series_analysis_data_variable_names:
-        series_analysis_data_series_cnt_FBAR =  (
-            series_analysis_data.variables['series_cnt_FBAR'][:] * var_scale
-        )
-    else:
-        print("WARNING: FBAR values not in file "+series_analysis_file
-              +"...setting to NaN")
-        series_analysis_data_series_cnt_FBAR = np.full(
-            (len(series_analysis_data_lat), len(series_analysis_data_lon)),
-            np.nan
-        )
-    if np.ma.is_masked(series_analysis_data_series_cnt_FBAR):
-        np.ma.set_fill_value(series_analysis_data_series_cnt_FBAR, np.nan)
-        series_analysis_data_series_cnt_FBAR = (
-            series_analysis_data_series_cnt_FBAR.filled()
-        )
-    if 'series_cnt_OBAR' in series_analysis_data_variable_names:
-        series_analysis_data_series_cnt_OBAR =  (
-            series_analysis_data.variables['series_cnt_OBAR'][:] * var_scale
-        )
-    else:
-        print("WARNING: OBAR values not in file "+series_analysis_file
-              +"...setting to NaN")
-        series_analysis_data_series_cnt_OBAR = np.full(
-            (len(series_analysis_data_lat), len(series_analysis_data_lon)),
-            np.nan
-        )
-    if np.ma.is_masked(series_analysis_data_series_cnt_OBAR):
-        np.ma.set_fill_value(series_analysis_data_series_cnt_OBAR, np.nan)
-        series_analysis_data_series_cnt_OBAR = (
-            series_analysis_data_series_cnt_OBAR.filled()
-        )
-    return (series_analysis_data_series_cnt_FBAR,
-            series_analysis_data_series_cnt_OBAR,
-            series_analysis_data_lat, series_analysis_data_lon)
-
 def draw_subplot_map(subplot_num, subplot_title, nsubplots, latlon_area,
                      var_levels):
     """ Draw map for subplot.
@@ -299,7 +252,9 @@ for env_var_model in env_var_model_list:
             if os.path.exists(input_file):
                 (model_data_series_cnt_FBAR, model_data_series_cnt_OBAR,
                  model_data_lat, model_data_lon) = (
-                     read_series_analysis_file(input_file, var_scale)
+                     maps2d_plot_util.read_series_analysis_file(
+                         input_file, var_scale
+                     )
                 )
                 if not 'model_var_levels_zonalmean_FBAR' in locals():
                     model_var_levels_zonalmean_FBAR = np.ones(
@@ -0,0 +1,84 @@
+'''
+Program Name: plot_style.py
+Contact(s): Mallory Row
+Abstract: Shared plotting style assets for the plotting scripts.
+          The NOAA and NWS logos are decoded once per process
+          and reused by every figure, and a script's plot
+          settings can be applied for the length of a plot with
+          a style context.
+'''
+
+import os
+import numpy as np
+import matplotlib
+matplotlib.use('agg')
+import matplotlib.image
+import matplotlib.pyplot as plt
+
+# Directory the logos are in, the same as this module
+LOGO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Decoded logo arrays, keyed by logo file name
+LOGO_ARRAY_CACHE = {}
+
+def get_logo_array(logo_file, cache_dir=None):
+    """! Get the decoded image array of a logo, decoding the
+         PNG only the first time it is asked for. If a cache
+         directory is given, the decoded array is saved there
+         as a .npy file and read back memory-mapped, so other
+         processes can share it without decoding the PNG.
+
+             Args:
+                 logo_file      - string of the logo file name
+                                  in the plotting scripts
+                                  directory
+                 cache_dir      - string of the directory to
+                                  keep the decoded arrays in,
+                                  defaults to the environment
+                                  variable PLOT_LOGO_CACHE_DIR
+                                  if set
+
+             Returns:
+                 logo_img_array - array of the logo image
+    """
+    if logo_file in LOGO_ARRAY_CACHE:
+        return LOGO_ARRAY_CACHE[logo_file]
+    if cache_dir is None:
+        cache_dir = os.environ.get('PLOT_LOGO_CACHE_DIR')
+    logo_png_file = os.path.join(LOGO_DIR, logo_file)
+    if cache_dir is None:
+        logo_img_array = matplotlib.image.imread(logo_png_file)
+    else:
+        logo_npy_file = os.path.join(
+            cache_dir, os.path.splitext(logo_file)[0]+'.npy'
+        )
+        if not os.path.exists(logo_npy_file) \
+                or (os.path.getmtime(logo_npy_file)
+                    < os.path.getmtime(logo_png_file)):
+            if not os.path.exists(cache_dir):
+                try:
+                    os.makedirs(cache_dir)
+                except OSError:
+                    # Another process made it first
+                    pass
+            tmp_logo_npy_file = logo_npy_file+'.tmp'+str(os.getpid())
+            with open(tmp_logo_npy_file, 'wb') as tmp_file:
+                np.save(tmp_file, matplotlib.image.imread(logo_png_file))
+            os.rename(tmp_logo_npy_file, logo_npy_file)
+        logo_img_array = np.load(logo_npy_file, mmap_mode='r')
+    LOGO_ARRAY_CACHE[logo_file] = logo_img_array
+    return logo_img_array
+
+def style_context(plot_rcParams):
+    """! Get a context that applies plot settings and restores
+         the previous settings when it exits
+
+             Args:
+                 plot_rcParams - dictionary of the matplotlib
+                                 rcParams to apply
+
+             Returns:
+                 context       - context manager applying the
+                                 plot settings
+    """
+    return plt.rc_context(rc=plot_rcParams)
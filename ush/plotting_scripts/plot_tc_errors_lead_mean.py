@@ -8,6 +8,7 @@ import warnings
 import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
+import plot_style as plot_style
 
 warnings.filterwarnings('ignore')
 
@@ -77,15 +78,11 @@ model_obs_plot_settings_dict = {
             'marker': 'None', 'markersize': 0,
             'linestyle': 'solid', 'linewidth': 2}
 }
-noaa_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'noaa.png')
-)
+noaa_logo_img_array = plot_style.get_logo_array('noaa.png')
 noaa_logo_xpixel_loc = x_figsize*plt.rcParams['figure.dpi']*0.1
 noaa_logo_ypixel_loc = y_figsize*plt.rcParams['figure.dpi']*0.865
 noaa_logo_alpha = 0.5
-nws_logo_img_array = matplotlib.image.imread(
-    os.path.join(os.environ['USHverif_global'], 'plotting_scripts', 'nws.png')
-)
+nws_logo_img_array = plot_style.get_logo_array('nws.png')
 nws_logo_xpixel_loc = x_figsize*plt.rcParams['figure.dpi']*0.9
 nws_logo_ypixel_loc = y_figsize*plt.rcParams['figure.dpi']*0.865
 nws_logo_alpha = 0.5
@@ -245,30 +242,24 @@ if os.path.exists(summary_tcst_filename):
                         else:
                             leads_list.append(lead[1:3])
                     leads = np.asarray(leads_list, dtype=int)
-                    for fhr in fhrs:
-                        fhr_idx = np.where(fhr == fhrs)[0][0]
-                        if fhr in leads:
-                            matching_lead_idx = np.where(fhr == leads)[0][0]
-                            fhrs_column_amodel_mean[fhr_idx] = (
-                                summary_tcst_data_COLUMN_AMODEL_MEAN[
-                                    matching_lead_idx
-                                ]
-                            )
-                            fhrs_column_amodel_total[fhr_idx] = (
-                                summary_tcst_data_COLUMN_AMODEL_TOTAL[
-                                    matching_lead_idx
-                                ]
-                            )
-                            fhrs_column_amodel_mean_ncl[fhr_idx] = (
-                                summary_tcst_data_COLUMN_AMODEL_MEAN_NCL[
-                                    matching_lead_idx
-                                ]
-                            )
-                            fhrs_column_amodel_mean_ncu[fhr_idx] = (
-                                summary_tcst_data_COLUMN_AMODEL_MEAN_NCU[
-                                    matching_lead_idx
-                                ]
-                            )
+                    fhrs_column_amodel_data = plot_util.align_to_axis(
+                        leads,
+                        np.column_stack(
+                            (summary_tcst_data_COLUMN_AMODEL_MEAN,
+                             summary_tcst_data_COLUMN_AMODEL_TOTAL,
+                             summary_tcst_data_COLUMN_AMODEL_MEAN_NCL,
+                             summary_tcst_data_COLUMN_AMODEL_MEAN_NCU)
+                        ),
+                        fhrs
+                    )
+                    fhrs_column_amodel_mean = fhrs_column_amodel_data[:,0]
+                    fhrs_column_amodel_total = fhrs_column_amodel_data[:,1]
+                    fhrs_column_amodel_mean_ncl = (
+                        fhrs_column_amodel_data[:,2]
+                    )
+                    fhrs_column_amodel_mean_ncu = (
+                        fhrs_column_amodel_data[:,3]
+                    )
                 fhrs_column_amodel_mean = np.ma.masked_invalid(
                     fhrs_column_amodel_mean
                 )
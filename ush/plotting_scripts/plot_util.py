@@ -1,3 +1,16 @@
+import os
+import hashlib
+import logging
+import multiprocessing
+import time
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 import numpy as np
 import datetime as datetime
 import pandas as pd
@@ -245,6 +258,534 @@ def get_stat_file_line_type_columns(logger, met_version, line_type):
             ]
     return stat_file_line_type_columns
 
+def get_stat_file_cache_filename(stat_file, met_version, cache_dir):
+    """! Get the name of the columnar cache file for a MET .stat
+         file, keyed by the file path, modification time, size
+         and MET version. The name starts with the stat file name
+         and a hash of its path, shared by all cache files of the
+         same stat file.
+
+             Args:
+                 stat_file   - string of the path to the MET .stat file
+                 met_version - string of MET version number
+                               being used to run stat_analysis
+                 cache_dir   - string of the directory holding the
+                               cache files
+
+             Returns:
+                 cache_file - string of the path to the cache file
+    """
+    stat_file_info = os.stat(stat_file)
+    path_key = os.path.abspath(stat_file)
+    cache_key = '|'.join([repr(stat_file_info.st_mtime),
+                          str(stat_file_info.st_size),
+                          str(float(met_version))])
+    cache_file = os.path.join(
+        cache_dir,
+        os.path.basename(stat_file)+'.'
+        +hashlib.md5(path_key.encode('utf-8')).hexdigest()[:16]+'.'
+        +hashlib.md5(cache_key.encode('utf-8')).hexdigest()+'.npz'
+    )
+    return cache_file
+
+def remove_superseded_stat_file_cache(cache_file):
+    """! Remove the cache files of the same MET .stat file written
+         for an earlier modification time, size or MET version,
+         which can no longer be read
+
+             Args:
+                 cache_file - string of the path to the current
+                              cache file
+
+             Returns:
+    """
+    cache_dir = os.path.dirname(cache_file)
+    cache_file_prefix = os.path.basename(cache_file).rsplit('.', 2)[0]+'.'
+    for cache_file_name in os.listdir(cache_dir):
+        if (cache_file_name.startswith(cache_file_prefix)
+                and cache_file_name.endswith('.npz')
+                and not cache_file_name.endswith('.tmp.npz')
+                and cache_file_name != os.path.basename(cache_file)):
+            try:
+                os.remove(os.path.join(cache_dir, cache_file_name))
+            except OSError:
+                pass
+
+def name_stat_file_columns(logger, stat_file_data, met_version):
+    """! Rename the columns of a dataframe read from a MET .stat
+         file to the standard and line type column names
+
+             Args:
+                 logger         - logging file
+                 stat_file_data - dataframe of the MET .stat file
+                                  columns, numbered
+                 met_version    - string of MET version number
+                                  being used to run stat_analysis
+
+             Returns:
+                 stat_file_data - dataframe of the MET .stat file
+                                  columns, named
+    """
+    stat_file_base_columns = get_stat_file_base_columns(met_version)
+    stat_file_data.rename(
+        columns=dict(
+            zip(stat_file_data.columns[:len(stat_file_base_columns)],
+                stat_file_base_columns)
+        ),
+        inplace=True
+    )
+    line_type = stat_file_data['LINE_TYPE'].iloc[0]
+    stat_file_line_type_columns = get_stat_file_line_type_columns(
+        logger, met_version, line_type
+    )
+    stat_file_data.rename(
+        columns=dict(
+            zip(stat_file_data.columns[len(stat_file_base_columns):],
+                stat_file_line_type_columns)
+        ),
+        inplace=True
+    )
+    return stat_file_data
+
+def get_stat_file_cache_arrays(stat_file_data):
+    """! Get the arrays to save in a .npz cache file for the
+         columns of a MET .stat file dataframe
+
+             Args:
+                 stat_file_data - dataframe of the MET .stat file
+                                  columns
+
+             Returns:
+                 cache_arrays   - dictionary of the column names
+                                  and arrays of their values, with
+                                  the column order under COLUMNS
+    """
+    cache_arrays = {}
+    for column in stat_file_data.columns:
+        if pd.api.types.is_numeric_dtype(stat_file_data[column]):
+            cache_arrays[str(column)] = (
+                np.asarray(stat_file_data[column].values)
+            )
+        else:
+            cache_arrays[str(column)] = (
+                np.asarray(stat_file_data[column].values).astype(str)
+            )
+    cache_arrays['COLUMNS'] = np.array(
+        [str(column) for column in stat_file_data.columns]
+    )
+    return cache_arrays
+
+def write_stat_file_cache(logger, cache_file, cache_arrays):
+    """! Write a .npz cache file, writing to a temporary file and
+         renaming so other jobs never read a partially written
+         cache file
+
+             Args:
+                 logger       - logging file
+                 cache_file   - string of the path to the cache file
+                 cache_arrays - dictionary of the array names and
+                                arrays to save
+
+             Returns:
+                 cached       - boolean of whether the cache file
+                                was written
+    """
+    cache_file_tmp = (
+        cache_file.replace('.npz', '.'+str(os.getpid())+'.tmp.npz')
+    )
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        np.savez(cache_file_tmp, **cache_arrays)
+        os.rename(cache_file_tmp, cache_file)
+        cached = True
+    except (IOError, OSError) as e:
+        logger.warning("Could not write cache file "+cache_file+": "
+                       +str(e))
+        cached = False
+    return cached
+
+def clean_stat_file_cache(logger, cache_dir, max_age_days, max_size_mb):
+    """! Remove .npz cache files not used within max_age_days,
+         then remove the least recently used cache files until
+         the cache directory is no larger than max_size_mb
+
+             Args:
+                 logger       - logging file
+                 cache_dir    - string of the directory holding the
+                                cache files
+                 max_age_days - float of the number of days a cache
+                                file is kept since last used,
+                                0 to not remove by age
+                 max_size_mb  - float of the size in megabytes the
+                                cache directory is limited to,
+                                0 to not remove by size
+
+             Returns:
+                 nremoved     - integer of the number of cache
+                                files removed
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    cache_file_info_list = []
+    for cache_file_name in os.listdir(cache_dir):
+        if not cache_file_name.endswith('.npz'):
+            continue
+        cache_file = os.path.join(cache_dir, cache_file_name)
+        try:
+            cache_file_stat = os.stat(cache_file)
+        except OSError:
+            continue
+        cache_file_info_list.append(
+            (cache_file_stat.st_mtime, cache_file_stat.st_size, cache_file)
+        )
+    cache_file_info_list.sort()
+    remove_file_list = []
+    if max_age_days > 0:
+        oldest_mtime = time.time() - (max_age_days * 86400.)
+        while (len(cache_file_info_list) != 0
+                and cache_file_info_list[0][0] < oldest_mtime):
+            remove_file_list.append(cache_file_info_list.pop(0)[2])
+    if max_size_mb > 0:
+        cache_size = sum(info[1] for info in cache_file_info_list)
+        while (len(cache_file_info_list) != 0
+                and cache_size > max_size_mb * 1024. * 1024.):
+            cache_file_info = cache_file_info_list.pop(0)
+            cache_size-=cache_file_info[1]
+            remove_file_list.append(cache_file_info[2])
+    nremoved = 0
+    for remove_file in remove_file_list:
+        try:
+            os.remove(remove_file)
+            nremoved+=1
+        except OSError:
+            pass
+    if nremoved != 0:
+        logger.info("Removed "+str(nremoved)+" cache files from "
+                    +cache_dir)
+    return nremoved
+
+def read_stat_file_incremental(logger, stat_file, met_version, cache_dir):
+    """! Read a MET .stat file, reusing the rows parsed in earlier
+         reads of a file with the same name, e.g. the previous
+         day's verification window. Only rows not seen before,
+         like newly arrived days, are parsed and the row cache
+         is updated to the rows of this file.
+
+             Args:
+                 logger      - logging file
+                 stat_file   - string of the path to the MET .stat file
+                 met_version - string of MET version number
+                               being used to run stat_analysis
+                 cache_dir   - string of the directory holding the
+                               cache files
+
+             Returns:
+                 stat_file_data - dataframe of the MET .stat file
+                                  columns
+    """
+    rows_cache_file = os.path.join(
+        cache_dir, os.path.basename(stat_file)+'.rows.npz'
+    )
+    with open(stat_file) as sf:
+        sf.readline()
+        stat_file_rows = [row.rstrip() for row in sf if row.strip()]
+    cached_rows = []
+    cached_data = None
+    if os.path.exists(rows_cache_file):
+        cache_data = np.load(rows_cache_file)
+        try:
+            if (float(cache_data['MET_VERSION'])
+                    == float(met_version)):
+                cached_rows = cache_data['ROWS'].tolist()
+                cache_columns = cache_data['COLUMNS'].tolist()
+                cached_data = pd.DataFrame(
+                    dict((column, cache_data[column])
+                         for column in cache_columns),
+                    columns=cache_columns
+                )
+        finally:
+            cache_data.close()
+    row_position_dict = dict(
+        (row, position) for position, row in enumerate(cached_rows)
+    )
+    new_rows = []
+    for row in stat_file_rows:
+        if row not in row_position_dict:
+            row_position_dict[row] = len(cached_rows) + len(new_rows)
+            new_rows.append(row)
+    logger.debug("Reusing "+str(len(stat_file_rows) - len(new_rows))
+                 +" cached rows and parsing "+str(len(new_rows))
+                 +" new rows of "+stat_file)
+    if len(new_rows) != 0:
+        new_data = name_stat_file_columns(
+            logger,
+            pd.read_csv(StringIO(u'\n'.join(new_rows)), sep=" ",
+                        skipinitialspace=True, header=None),
+            met_version
+        )
+        if cached_data is None or len(cached_data) == 0:
+            all_data = new_data
+        else:
+            all_data = pd.concat([cached_data, new_data],
+                                 ignore_index=True)
+    else:
+        all_data = cached_data
+    stat_file_data = all_data.iloc[
+        [row_position_dict[row] for row in stat_file_rows]
+    ].reset_index(drop=True)
+    if len(new_rows) != 0 or len(cached_rows) != len(stat_file_rows):
+        rows_cache_arrays = get_stat_file_cache_arrays(stat_file_data)
+        rows_cache_arrays['ROWS'] = np.array(stat_file_rows)
+        rows_cache_arrays['MET_VERSION'] = np.array(float(met_version))
+        write_stat_file_cache(logger, rows_cache_file, rows_cache_arrays)
+    elif os.path.exists(rows_cache_file):
+        # mark the row cache as used for clean_stat_file_cache
+        os.utime(rows_cache_file, None)
+    return stat_file_data
+
+def read_stat_file(logger, stat_file, met_version, cache_dir=None,
+                   columns=None, incremental=False):
+    """! Read a MET .stat file into a dataframe with the standard
+         and line type column names. The parsed columns are
+         cached in a .npz file so later reads of the same file
+         skip the text parsing.
+
+             Args:
+                 logger      - logging file
+                 stat_file   - string of the path to the MET .stat file
+                 met_version - string of MET version number
+                               being used to run stat_analysis
+                 cache_dir   - string of the directory holding the
+                               cache files, None to not use a cache
+                 columns     - list of the columns to read,
+                               None to read all columns
+                 incremental - boolean of whether to only parse the
+                               rows not cached from earlier reads
+                               of a file with the same name, needs
+                               cache_dir
+
+             Returns:
+                 stat_file_data - dataframe of the MET .stat file
+                                  columns
+    """
+    if cache_dir is not None:
+        cache_file = get_stat_file_cache_filename(stat_file, met_version,
+                                                  cache_dir)
+        if os.path.exists(cache_file):
+            logger.debug("Reading "+stat_file+" from cache file "
+                         +cache_file)
+            cache_data = np.load(cache_file)
+            try:
+                cache_columns = cache_data['COLUMNS'].tolist()
+                if columns is not None:
+                    cache_columns = [
+                        column for column in cache_columns
+                        if column in columns
+                    ]
+                stat_file_data = pd.DataFrame(
+                    dict((column, cache_data[column])
+                         for column in cache_columns),
+                    columns=cache_columns
+                )
+            finally:
+                cache_data.close()
+            # mark the cache file as used for clean_stat_file_cache
+            os.utime(cache_file, None)
+            return stat_file_data
+    if cache_dir is not None and incremental:
+        stat_file_data = read_stat_file_incremental(logger, stat_file,
+                                                    met_version, cache_dir)
+    else:
+        stat_file_data = name_stat_file_columns(
+            logger,
+            pd.read_csv(stat_file, sep=" ", skiprows=1,
+                        skipinitialspace=True, header=None),
+            met_version
+        )
+    if cache_dir is not None:
+        if write_stat_file_cache(logger, cache_file,
+                                 get_stat_file_cache_arrays(stat_file_data)):
+            logger.debug("Cached "+stat_file+" as "+cache_file)
+            remove_superseded_stat_file_cache(cache_file)
+    if columns is not None:
+        stat_file_data = stat_file_data[
+            [column for column in stat_file_data.columns
+             if column in columns]
+        ]
+    return stat_file_data
+
+def get_stat_file_unit_scales(fcst_var_name, fcst_var_level):
+    """! Get the factors to divide the MET .stat file line
+         type columns by to convert to plotting units
+
+             Args:
+                 fcst_var_name  - string of the forecast variable
+                                  name
+                 fcst_var_level - string of the forecast variable
+                                  level
+
+             Returns:
+                 unit_scales - dictionary of column names and
+                               the factors to divide them by
+    """
+    if fcst_var_name == 'PRMSL' \
+            or (fcst_var_name == 'PRES' and fcst_var_level == 'Z0'):
+        # Pa to hPa
+        unit_scales = {
+            'FBAR': 100., 'OBAR': 100.,
+            'FFBAR': 100.*100., 'FOBAR': 100.*100., 'OOBAR': 100.*100.
+        }
+    else:
+        unit_scales = {}
+    return unit_scales
+
+def get_axis_positions(keys, axis_keys):
+    """! Get the position of each entry of a target axis in a list
+         of keys, through a position map built once
+
+             Args:
+                 keys       - list or array of the keys of the
+                              table, e.g. the leads in a file
+                 axis_keys  - list or array of the keys of the
+                              target axis, e.g. the leads to plot
+
+             Returns:
+                 positions  - array of the positions of the
+                              target axis keys in keys, the first
+                              if a key is listed more than once,
+                              like list.index, and -1 if missing
+    """
+    key_positions = {}
+    for n, key in enumerate(keys):
+        key_positions.setdefault(key, n)
+    positions = np.array([key_positions.get(axis_key, -1)
+                          for axis_key in axis_keys], dtype=int)
+    return positions
+
+def align_to_axis(keys, values, axis_keys, axis=0):
+    """! Align a table of values with keys, e.g. leads,
+         thresholds, levels or dates, to a target axis,
+         leaving the missing keys as NaN
+
+             Args:
+                 keys       - list or array of the keys of the
+                              table
+                 values     - array of the table values, with
+                              one entry per key along axis
+                 axis_keys  - list or array of the keys of the
+                              target axis
+                 axis       - integer of the dimension of values
+                              the keys are along
+
+             Returns:
+                 aligned_values - array of the values with one
+                                  entry per target axis key along
+                                  axis, NaN where missing
+    """
+    values = np.asarray(values, dtype=float)
+    positions = get_axis_positions(keys, axis_keys)
+    in_keys = positions != -1
+    aligned_shape = list(values.shape)
+    aligned_shape[axis] = len(positions)
+    aligned_values = np.full(aligned_shape, np.nan)
+    aligned_index = [slice(None)] * values.ndim
+    aligned_index[axis] = in_keys
+    values_index = [slice(None)] * values.ndim
+    values_index[axis] = positions[in_keys]
+    aligned_values[tuple(aligned_index)] = values[tuple(values_index)]
+    return aligned_values
+
+def align_stat_file_data(stat_file_data, expected_stat_file_dates,
+                         stat_file_line_type_columns, data_index,
+                         unit_scales=None):
+    """! Align the rows of the MET .stat file data to the
+         expected dates, leaving missing dates as NaN
+
+             Args:
+                 stat_file_data              - dataframe of the MET
+                                               .stat file columns
+                 expected_stat_file_dates    - list of dates expected
+                                               to be found in the MET
+                                               .stat file, formatted
+                                               as "%Y%m%d"+"_"+"%H%M%S"
+                 stat_file_line_type_columns - list of the line type
+                                               columns
+                 data_index                  - index for the returned
+                                               dataframe, one entry per
+                                               expected date
+                 unit_scales                 - dictionary of column
+                                               names and the factors
+                                               to divide them by
+
+             Returns:
+                 aligned_data - dataframe of the line type columns
+                                for the expected dates
+    """
+    aligned_values = align_to_axis(
+        stat_file_data['FCST_VALID_BEG'].values,
+        stat_file_data[stat_file_line_type_columns].values,
+        expected_stat_file_dates
+    )
+    if unit_scales:
+        for column, scale in unit_scales.items():
+            if column in stat_file_line_type_columns:
+                aligned_values[:,stat_file_line_type_columns.index(column)] /= (
+                    scale
+                )
+    aligned_data = pd.DataFrame(aligned_values, index=data_index,
+                                columns=stat_file_line_type_columns)
+    return aligned_data
+
+def event_equalize(logger, model_data):
+    """! Event equalize the models' data, keeping only the dates
+         with data for every model. A date has data if its TOTAL
+         is not missing, so line type columns no statistic uses,
+         e.g. confidence limits MET writes as NA, do not drop it.
+         The dates with data are found once on the loaded data,
+         for each combination of the middle index levels (e.g.
+         leads or levels) separately, and the data of the other
+         dates is set to missing for all models so every
+         statistic, average, and confidence interval uses the
+         same sample.
+
+             Args:
+                 logger            - logging file
+                 model_data        - dataframe of the models' .stat
+                                     line type columns, indexed by
+                                     model first and dates last
+
+             Returns:
+                 model_data        - dataframe of the event
+                                     equalized .stat line type
+                                     columns
+    """
+    index_shape = [
+        len(model_data.index.get_level_values(level).unique())
+        for level in range(model_data.index.nlevels)
+    ]
+    ncolumns = len(model_data.columns)
+    model_data_values = (
+        model_data.values.astype(float).reshape(index_shape+[ncolumns])
+    )
+    if 'TOTAL' in model_data.columns:
+        model_dates_mask = np.isfinite(
+            model_data_values[...,list(model_data.columns).index('TOTAL')]
+        )
+    else:
+        model_dates_mask = np.isfinite(model_data_values).all(axis=-1)
+    common_dates_mask = model_dates_mask.all(axis=0)
+    model_data_values[:,~common_dates_mask,:] = np.nan
+    logger.debug("Event equalization kept "
+                 +str(np.count_nonzero(common_dates_mask))+" of "
+                 +str(common_dates_mask.size)+" dates")
+    model_data = pd.DataFrame(
+        model_data_values.reshape(len(model_data.index), ncolumns),
+        index=model_data.index, columns=model_data.columns
+    )
+    return model_data
+
 def get_clevels(data):
     """! Get contour levels for plotting
   
@@ -269,6 +810,115 @@ def get_clevels(data):
     clevels = np.around(np.linspace(cmin, cmax, 11, endpoint=True), decimals=3)
     return clevels
 
+# Line types whose columns are means over the matched pairs, which
+# are aggregated weighted by the number of matched pairs, TOTAL
+TOTAL_WEIGHTED_LINE_TYPES = ['SL1L2', 'SAL1L2', 'VL1L2', 'VAL1L2']
+
+def aggregate_partial_sums(line_type, partial_sums, date_counts=None):
+    """! Aggregate daily partial sums along the date axis. The mean
+         columns of the TOTAL_WEIGHTED_LINE_TYPES are weighted by
+         TOTAL, leaving the dates where the column or TOTAL is
+         missing out of both the sum and the weights. The other
+         columns are summed, counting missing dates as 0, and
+         divided by the number of dates.
+
+             Args:
+                 line_type        - string of the line type
+                 partial_sums     - dictionary of the line type column
+                                    names and arrays of their values,
+                                    dates along the last axis
+                 date_counts      - array of the number of times each
+                                    date is counted, dates along the
+                                    last axis, e.g. one row per
+                                    bootstrap resample, None to count
+                                    each date once
+
+             Returns:
+                 partial_sums_agg - dictionary of the line type column
+                                    names and arrays of their
+                                    aggregated values, the date axis
+                                    replaced by the leading axes of
+                                    date_counts if given
+    """
+    total_weighted = (line_type in TOTAL_WEIGHTED_LINE_TYPES
+                      and 'TOTAL' in partial_sums)
+    if total_weighted:
+        totals = np.asarray(partial_sums['TOTAL'], dtype=float)
+        totals_valid = np.isfinite(totals) & (np.nan_to_num(totals) > 0)
+    partial_sums_agg = {}
+    for column, values in partial_sums.items():
+        values = np.asarray(values, dtype=float)
+        if total_weighted and column != 'TOTAL':
+            valid = np.isfinite(values) & totals_valid
+            weighted_values = np.where(valid, values*totals, 0.)
+            weights = np.where(valid, totals, 0.)
+            if date_counts is None:
+                weighted_values_sum = np.sum(weighted_values, axis=-1)
+                weights_sum = np.sum(weights, axis=-1)
+            else:
+                weighted_values_sum = np.dot(weighted_values, date_counts.T)
+                weights_sum = np.dot(weights, date_counts.T)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                partial_sums_agg[column] = np.where(
+                    weights_sum > 0, weighted_values_sum/weights_sum, np.nan
+                )
+        elif date_counts is None:
+            partial_sums_agg[column] = (
+                np.nansum(values, axis=-1)/values.shape[-1]
+            )
+        else:
+            partial_sums_agg[column] = (
+                np.dot(np.nan_to_num(values), date_counts.T)
+                /values.shape[-1]
+            )
+    return partial_sums_agg
+
+def calculate_average_from_arrays(logger, average_method, line_type, stat,
+                                  partial_sums, stat_values=None):
+    """! Calculate the average of the statistic along the date
+         axis for all the leading axes (models, Monte Carlo
+         tests, etc.) at once
+        
+             Args:
+                 logger         - logging file
+                 average_method - string of the method to 
+                                  use to calculate the
+                                  average
+                 line_type      - string of the line type
+                 stat           - string of the statistic the
+                                  average is being taken for
+                 partial_sums   - dictionary of the line type column
+                                  names and arrays of their values,
+                                  dates along the last axis
+                 stat_values    - masked array of statistic values,
+                                  dates along the last axis, None
+                                  to calculate from partial_sums
+ 
+             Returns:
+                 average_array  - masked array of average value(s)
+    """
+    if average_method in ['MEAN', 'MEDIAN']:
+        if stat_values is None:
+            stat_values = np.ma.masked_invalid(
+                calculate_stat_from_arrays(logger, line_type,
+                                           partial_sums, stat)
+            )
+        if average_method == 'MEAN':
+            average_array = np.ma.mean(stat_values, axis=-1)
+        else:
+            average_array = np.ma.median(stat_values, axis=-1)
+    elif average_method == 'AGGREGATION':
+        partial_sums_avg = aggregate_partial_sums(line_type, partial_sums)
+        average_array = np.ma.masked_invalid(
+            np.array(calculate_stat_from_arrays(logger, line_type,
+                                                partial_sums_avg, stat))
+        )
+    else:
+        logger.error("Invalid entry for MEAN_METHOD, "
+                     +"use MEAN, MEDIAN, or AGGREGATION")
+        exit(1)
+    return average_array
+
 def calculate_average(logger, average_method, stat, model_dataframe,
                       model_stat_values):
     """! Calculate average of dataset
@@ -281,48 +931,529 @@ def calculate_average(logger, average_method, stat, model_dataframe,
                  stat                 - string of the statistic the
                                         average is being taken for
                  model_dataframe      - dataframe of model .stat
-                                        columns
+                                        columns, dates as the last
+                                        index level
                  model_stat_values    - array of statistic values
  
              Returns:
                  average_array        - array of average value(s)
     """
-    if average_method == 'MEAN':
-        average_array = np.empty_like(model_stat_values[:,0])
-        for l in range(len(model_stat_values[:,0])):
-            average_array[l] = np.ma.mean(model_stat_values[l,:])
-    elif average_method == 'MEDIAN':
-        average_array = np.empty_like(model_stat_values[:,0])
-        for l in range(len(model_stat_values[:,0])):
-            average_array[l] = np.ma.median(model_stat_values[l,:])
-    elif average_method == 'AGGREGATION':
-         ndays = model_dataframe.index.get_level_values('dates').unique().shape[0]
-         if 'ntest' in model_dataframe.index.names:
-            model_dataframe_aggsum = (
-                model_dataframe.groupby(['model_plot_name', 'ntest']).agg(['sum'])
+    model_dataframe_columns = model_dataframe.columns.values.tolist()
+    line_type = get_stat_line_type(logger, model_dataframe_columns)
+    index_shape = [
+        len(model_dataframe.index.get_level_values(level).unique())
+        for level in range(model_dataframe.index.nlevels)
+    ]
+    if (average_method == 'AGGREGATION'
+            and line_type in TOTAL_WEIGHTED_LINE_TYPES
+            and model_dataframe.index.nlevels > 1):
+        # Stream the rows through the aggregator, keyed by the
+        # index levels other than the dates
+        key_index = model_dataframe.index.droplevel(-1)
+        key_columns = ['KEY'+str(level)
+                       for level in range(key_index.nlevels)]
+        aggregator = PartialSumAggregator(logger, line_type,
+                                          model_dataframe_columns,
+                                          key_columns)
+        model_rows = model_dataframe.reset_index(drop=True)
+        key_list = []
+        for level, key_column in enumerate(key_columns):
+            model_rows[key_column] = key_index.get_level_values(level)
+            key_list.append(key_index.get_level_values(level))
+        keys = []
+        for key in zip(*key_list):
+            if key not in keys:
+                keys.append(key)
+        aggregator.add_rows(model_rows)
+        partial_sums_agg = dict(
+            (column, values.reshape(index_shape[:-1]))
+            for column, values
+            in aggregator.get_partial_sums_arrays(keys).items()
+        )
+        average_array = np.ma.masked_invalid(
+            np.array(calculate_stat_from_arrays(logger, line_type,
+                                                partial_sums_agg, stat))
+        )
+        return average_array
+    partial_sums = dict(
+        (column,
+         model_dataframe[column].values.astype(float).reshape(index_shape))
+        for column in model_dataframe_columns
+    )
+    average_array = calculate_average_from_arrays(
+        logger, average_method, line_type, stat, partial_sums,
+        stat_values=model_stat_values
+    )
+    return average_array
+
+class PartialSumAggregator(object):
+    """! Running TOTAL weighted aggregation of MET SL1L2, SAL1L2,
+         VL1L2, or VAL1L2 partial sums for each key, e.g. model
+         and forecast lead. Rows are consumed a chunk at a time
+         and only the running sums are kept, so aggregated
+         statistics are available at any time without holding
+         the full table. Missing values of a column are left out
+         of both its sum and its TOTAL weight, as in
+         aggregate_partial_sums.
+    """
+
+    def __init__(self, logger, line_type, columns, key_columns):
+        """! Initialize the aggregator
+
+                 Args:
+                     logger      - logging file
+                     line_type   - string of the line type of the
+                                   partial sums
+                     columns     - list of the line type columns
+                     key_columns - list of the column names whose
+                                   values make up the keys
+        """
+        if line_type not in TOTAL_WEIGHTED_LINE_TYPES:
+            logger.error("Cannot aggregate line type "+line_type+", "
+                         +"use "+", ".join(TOTAL_WEIGHTED_LINE_TYPES))
+            exit(1)
+        self.logger = logger
+        self.line_type = line_type
+        self.mean_columns = [column for column in columns
+                             if column != 'TOTAL']
+        self.key_columns = list(key_columns)
+        self.totals = {}
+        self.weighted_sums = {}
+        self.weights = {}
+
+    def add_rows(self, stat_file_data):
+        """! Add the rows of a dataframe of MET .stat file columns
+             to the running sums; rows without a positive TOTAL
+             are skipped
+
+                 Args:
+                     stat_file_data - dataframe of the MET .stat
+                                      file columns, with the key
+                                      and line type columns
+        """
+        totals = stat_file_data['TOTAL'].values.astype(float)
+        totals_valid = np.isfinite(totals) & (np.nan_to_num(totals) > 0)
+        if not totals_valid.any():
+            return
+        stat_file_data = stat_file_data[totals_valid]
+        totals = totals[totals_valid][:,None]
+        values = stat_file_data[self.mean_columns].values.astype(float)
+        valid = np.isfinite(values)
+        # Weighted sums, then weights, then TOTAL for each row
+        sums_data = pd.DataFrame(
+            np.hstack([np.where(valid, values*totals, 0.),
+                       np.where(valid, totals, 0.),
+                       totals])
+        )
+        for key_column in self.key_columns:
+            sums_data[key_column] = stat_file_data[key_column].values
+        key_sums_data = sums_data.groupby(self.key_columns).sum()
+        ncolumns = len(self.mean_columns)
+        for key, key_sums in zip(key_sums_data.index,
+                                 key_sums_data.values.astype(float)):
+            if not isinstance(key, tuple):
+                key = (key,)
+            if key in self.totals:
+                self.weighted_sums[key]+=key_sums[:ncolumns]
+                self.weights[key]+=key_sums[ncolumns:2*ncolumns]
+                self.totals[key]+=key_sums[-1]
+            else:
+                self.weighted_sums[key] = key_sums[:ncolumns].copy()
+                self.weights[key] = key_sums[ncolumns:2*ncolumns].copy()
+                self.totals[key] = key_sums[-1]
+
+    def add_stat_file_rows(self, stat_file_rows, met_version):
+        """! Parse MET .stat file rows of the aggregator's line type
+             and add them to the running sums
+
+                 Args:
+                     stat_file_rows - list of the MET .stat file
+                                      row strings
+                     met_version    - string of MET version number
+                                      being used to run stat_analysis
+        """
+        self.add_rows(name_stat_file_columns(
+            self.logger,
+            pd.read_csv(StringIO(u''.join(stat_file_rows)), sep=" ",
+                        skipinitialspace=True, header=None),
+            met_version
+        ))
+
+    def add_stat_file(self, stat_file, met_version, chunksize=100000):
+        """! Add the rows of the aggregator's line type in a MET .stat
+             file to the running sums, parsing a chunk of rows at a
+             time. The rows are picked by their LINE_TYPE before the
+             columns are named, as the line types of a file can have
+             different columns.
+
+                 Args:
+                     stat_file   - string of the path to the MET
+                                   .stat file
+                     met_version - string of MET version number
+                                   being used to run stat_analysis
+                     chunksize   - integer of the number of rows
+                                   to parse at a time
+        """
+        line_type_index = len(get_stat_file_base_columns(met_version)) - 1
+        stat_file_rows = []
+        with open(stat_file) as sf:
+            sf.readline()
+            for row in sf:
+                row_columns = row.split()
+                if (len(row_columns) > line_type_index
+                        and row_columns[line_type_index] == self.line_type):
+                    stat_file_rows.append(row)
+                if len(stat_file_rows) == chunksize:
+                    self.add_stat_file_rows(stat_file_rows, met_version)
+                    stat_file_rows = []
+        if len(stat_file_rows) != 0:
+            self.add_stat_file_rows(stat_file_rows, met_version)
+
+    def get_keys(self):
+        """! Get the keys aggregated so far
+
+                 Returns:
+                     keys - list of the key tuples, sorted
+        """
+        keys = sorted(self.totals.keys())
+        return keys
+
+    def get_partial_sums(self, key):
+        """! Get the aggregated partial sums for a key
+
+                 Args:
+                     key          - tuple of the key column values
+
+                 Returns:
+                     partial_sums - dictionary of the line type
+                                    column names and their
+                                    aggregated values, NaN for
+                                    columns without valid values
+                                    and keys without rows
+        """
+        if key not in self.totals:
+            partial_sums = dict((column, np.nan)
+                                for column in self.mean_columns)
+            partial_sums['TOTAL'] = np.nan
+            return partial_sums
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_values = np.where(
+                self.weights[key] > 0,
+                self.weighted_sums[key]/self.weights[key], np.nan
             )
-         else:
-             model_dataframe_aggsum = (
-                 model_dataframe.groupby('model_plot_name').agg(['sum'])
-             )
-         model_dataframe_aggsum.columns = (
-             model_dataframe_aggsum.columns.droplevel(1)
-         )
-         average_values, avg_array, stat_plot_name = (
-             calculate_stat(logger, model_dataframe_aggsum/ndays, stat)
-         )
-         if 'ntest' in model_dataframe.index.names:
-             average_array = avg_array[0,:]
-         else:
-             average_array = avg_array
-    else:
-        logger.error("Invalid entry for MEAN_METHOD, "
-                     +"use MEAN, MEDIAN, or AGGREGATION")
+        partial_sums = dict(zip(self.mean_columns, mean_values))
+        partial_sums['TOTAL'] = self.totals[key]
+        return partial_sums
+
+    def get_partial_sums_arrays(self, keys):
+        """! Get the aggregated partial sums for a list of keys
+
+                 Args:
+                     keys         - list of the key tuples
+
+                 Returns:
+                     partial_sums - dictionary of the line type
+                                    column names and arrays of
+                                    their aggregated values, one
+                                    per key
+        """
+        key_partial_sums_list = [self.get_partial_sums(key) for key in keys]
+        partial_sums = dict(
+            (column, np.array([key_partial_sums[column]
+                               for key_partial_sums
+                               in key_partial_sums_list], dtype=float))
+            for column in self.mean_columns+['TOTAL']
+        )
+        return partial_sums
+
+    def calculate_stat(self, key, stat):
+        """! Calculate a statistic from the aggregated partial sums
+             for a key
+
+                 Args:
+                     key         - tuple of the key column values
+                     stat        - string of the simple statistic
+                                   name
+
+                 Returns:
+                     stat_values - float of the statistic value
+        """
+        stat_values = calculate_stat_from_arrays(
+            self.logger, self.line_type, self.get_partial_sums(key), stat
+        )
+        return stat_values
+
+def get_randx_filename(randx_dir):
+    """! Get the name of the binary file of the random numbers
+         used for the Monte Carlo confidence intervals
+
+             Args:
+                 randx_dir  - string of the directory holding
+                              the random number file
+
+             Returns:
+                 randx_file - string of the path to the random
+                              number file
+    """
+    randx_file = os.path.join(randx_dir, 'randx.npy')
+    return randx_file
+
+def write_randx(randx_file, nmodels, ntests, total_days):
+    """! Generate and save the random numbers used for the
+         Monte Carlo confidence intervals, one set per model,
+         as a binary .npy file shared by all the plots in a run
+
+             Args:
+                 randx_file - string of the path to the random
+                              number file
+                 nmodels    - integer of the number of models
+                 ntests     - integer of the number of Monte
+                              Carlo tests
+                 total_days - integer of the number of dates
+    """
+    randx = np.random.rand(nmodels, ntests, total_days)
+    # Write to a temporary file and rename so plots never
+    # read a partially written file
+    randx_file_tmp = randx_file.replace('.npy',
+                                        '.'+str(os.getpid())+'.tmp.npy')
+    np.save(randx_file_tmp, randx)
+    os.rename(randx_file_tmp, randx_file)
+
+def read_randx(logger, randx_file, nmodels, ntests, total_days):
+    """! Read the random numbers used for the Monte Carlo
+         confidence intervals, memory mapping the binary file
+
+             Args:
+                 logger     - logging file
+                 randx_file - string of the path to the random
+                              number file
+                 nmodels    - integer of the number of models
+                 ntests     - integer of the number of Monte
+                              Carlo tests
+                 total_days - integer of the number of dates
+
+             Returns:
+                 randx      - array of random numbers [0,1),
+                              number of models by number of tests
+                              by number of dates
+    """
+    if not os.path.exists(randx_file):
+        logger.error("Random number file "+randx_file+" does not exist")
         exit(1)
-    return average_array
+    randx = np.load(randx_file, mmap_mode='r')
+    if randx.shape[0] < nmodels or randx.shape[1:] != (ntests, total_days):
+        logger.error("Random number file "+randx_file+" has shape "
+                     +str(randx.shape)+", expected at least "
+                     +str((nmodels, ntests, total_days)))
+        exit(1)
+    return randx
+
+def get_lead_mean_filename(plotting_out_dir_data,
+                           fcst_var_name, fcst_var_level, fcst_var_extra,
+                           fcst_var_thresh, obs_var_name, obs_var_level,
+                           obs_var_extra, obs_var_thresh, interp, region):
+    """! Get the name of the binary file of the forecast lead
+         averages and confidence intervals of all the models and
+         statistics for a variable and region
+
+             Args:
+                 plotting_out_dir_data - string of the directory
+                                         holding the plotting data
+                 fcst_var_name         - string of the forecast
+                                         variable name
+                 fcst_var_level        - string of the forecast
+                                         variable level
+                 fcst_var_extra        - string of the forecast
+                                         variable extra options
+                 fcst_var_thresh       - string of the forecast
+                                         variable threshold
+                 obs_var_name          - string of the observation
+                                         variable name
+                 obs_var_level         - string of the observation
+                                         variable level
+                 obs_var_extra         - string of the observation
+                                         variable extra options
+                 obs_var_thresh        - string of the observation
+                                         variable threshold
+                 interp                - string of the interpolation
+                 region                - string of the region
+
+             Returns:
+                 lead_mean_file        - string of the path to the
+                                         lead average file
+    """
+    lead_mean_file = os.path.join(
+        plotting_out_dir_data,
+        "fcst"+fcst_var_name+fcst_var_level+fcst_var_extra+fcst_var_thresh
+        +"_obs"+obs_var_name+obs_var_level+obs_var_extra+obs_var_thresh
+        +"_interp"+interp
+        +"_region"+region
+        +"_LEAD_MEAN.npz"
+    )
+    return lead_mean_file
+
+def write_lead_mean_file(logger, lead_mean_file, lead, model_list,
+                         stat_list, lead_mean_array, ci_array_dict):
+    """! Add the averages and confidence intervals of one forecast
+         lead to a lead average file, replacing the values of that
+         lead if already in the file. The file is locked while
+         being updated so jobs for different leads can share it,
+         and written to a temporary file and renamed so plots never
+         read a partially written file.
+
+             Args:
+                 logger          - logging file
+                 lead_mean_file  - string of the path to the lead
+                                   average file
+                 lead            - string of the forecast lead
+                 model_list      - list of the model plot names
+                 stat_list       - list of the statistics
+                 lead_mean_array - array of the averages, number of
+                                   models by number of statistics by
+                                   2, the second holding the
+                                   observation average for
+                                   fbar_obar, NaN where missing
+                 ci_array_dict   - dictionary of the arrays of the
+                                   confidence intervals, number of
+                                   models by number of statistics,
+                                   keyed by the confidence interval
+                                   method, NaN where missing
+    """
+    logger.debug("Writing lead "+lead+" averages and confidence "
+                 +"intervals to file: "+lead_mean_file)
+    lock_file = open(lead_mean_file+'.lock', 'a')
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        file_arrays = {}
+        if os.path.exists(lead_mean_file):
+            lead_mean_file_data = np.load(lead_mean_file)
+            try:
+                for name in lead_mean_file_data.files:
+                    file_arrays[name] = lead_mean_file_data[name]
+            finally:
+                lead_mean_file_data.close()
+        else:
+            file_arrays['MODELS'] = np.array([], dtype=str)
+            file_arrays['STATS'] = np.array([], dtype=str)
+            file_arrays['LEADS'] = np.array([], dtype=str)
+            file_arrays['LEAD_MEAN'] = np.empty([0,0,0,2])
+        file_models = file_arrays['MODELS'].tolist()
+        file_stats = file_arrays['STATS'].tolist()
+        file_leads = file_arrays['LEADS'].tolist()
+        models = file_models + [model for model in model_list
+                                if model not in file_models]
+        stats = file_stats + [stat for stat in stat_list
+                              if stat not in file_stats]
+        leads = list(file_leads)
+        if lead not in leads:
+            leads.append(lead)
+        file_index = np.ix_(range(len(file_models)), range(len(file_stats)),
+                            range(len(file_leads)))
+        lead_index = np.ix_(get_axis_positions(models, model_list),
+                            get_axis_positions(stats, stat_list),
+                            get_axis_positions(leads, [lead]))
+        new_arrays = {
+            'MODELS': np.array(models, dtype=str),
+            'STATS': np.array(stats, dtype=str),
+            'LEADS': np.array(leads, dtype=str)
+        }
+        new_arrays['LEAD_MEAN'] = np.full(
+            [len(models), len(stats), len(leads), 2], np.nan
+        )
+        new_arrays['LEAD_MEAN'][file_index] = file_arrays['LEAD_MEAN']
+        new_arrays['LEAD_MEAN'][lead_index] = lead_mean_array[:,:,None,:]
+        ci_names = set([name for name in file_arrays
+                        if name.startswith('CI_')])
+        ci_names.update(['CI_'+ci_method for ci_method in ci_array_dict])
+        for ci_name in ci_names:
+            new_arrays[ci_name] = np.full(
+                [len(models), len(stats), len(leads)], np.nan
+            )
+            if ci_name in file_arrays:
+                new_arrays[ci_name][file_index] = file_arrays[ci_name]
+            if ci_name[3:] in ci_array_dict:
+                new_arrays[ci_name][lead_index] = (
+                    ci_array_dict[ci_name[3:]][:,:,None]
+                )
+        lead_mean_file_tmp = lead_mean_file.replace(
+            '.npz', '.'+str(os.getpid())+'.tmp.npz'
+        )
+        np.savez(lead_mean_file_tmp, **new_arrays)
+        os.rename(lead_mean_file_tmp, lead_mean_file)
+    finally:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+def read_lead_mean_file(logger, lead_mean_file, model_list, stat_list,
+                        lead_list, ci_method='NONE'):
+    """! Read the averages and confidence intervals of the models,
+         statistics and forecast leads asked for from a lead
+         average file
+
+             Args:
+                 logger         - logging file
+                 lead_mean_file - string of the path to the lead
+                                  average file
+                 model_list     - list of the model plot names
+                 stat_list      - list of the statistics
+                 lead_list      - list of the forecast leads
+                 ci_method      - string of the confidence interval
+                                  method, NONE to not read
+                                  confidence intervals
+
+             Returns:
+                 lead_mean_data - array of the averages, number of
+                                  models by number of statistics by
+                                  number of leads by 2, the second
+                                  holding the observation average
+                                  for fbar_obar, NaN where missing
+                 ci_data        - array of the confidence intervals,
+                                  number of models by number of
+                                  statistics by number of leads,
+                                  NaN where missing
+    """
+    lead_mean_data = np.full(
+        [len(model_list), len(stat_list), len(lead_list), 2], np.nan
+    )
+    ci_data = np.full([len(model_list), len(stat_list), len(lead_list)],
+                      np.nan)
+    if not os.path.exists(lead_mean_file):
+        logger.warning("Lead average file: "+lead_mean_file
+                       +" does not exist")
+        return lead_mean_data, ci_data
+    logger.debug("Lead average file: "+lead_mean_file+" exists")
+    lead_mean_file_data = np.load(lead_mean_file)
+    try:
+        file_models = lead_mean_file_data['MODELS']
+        for model in model_list:
+            if model not in file_models:
+                logger.warning("Model with plot name "+model+" not in "
+                               +"lead average file: "+lead_mean_file)
+        file_names_list = [(file_models, model_list),
+                           (lead_mean_file_data['STATS'], stat_list),
+                           (lead_mean_file_data['LEADS'], lead_list)]
+        lead_mean_data = lead_mean_file_data['LEAD_MEAN']
+        for axis, (file_names, names) in enumerate(file_names_list):
+            lead_mean_data = align_to_axis(file_names, lead_mean_data,
+                                           names, axis=axis)
+        if ci_method != 'NONE':
+            if 'CI_'+ci_method in lead_mean_file_data.files:
+                ci_data = lead_mean_file_data['CI_'+ci_method]
+                for axis, (file_names, names) in enumerate(file_names_list):
+                    ci_data = align_to_axis(file_names, ci_data, names,
+                                            axis=axis)
+            else:
+                logger.warning("No "+ci_method+" confidence "
+                               +"intervals in lead average file: "
+                               +lead_mean_file)
+    finally:
+        lead_mean_file_data.close()
+    return lead_mean_data, ci_data
 
 def calculate_ci(logger, ci_method, modelB_values, modelA_values, total_days,
-                 stat, average_method, randx):
+                 stat, average_method, randx, ntests_chunk=None):
     """! Calculate confidence intervals between two sets of data
  
              Args:
@@ -340,6 +1471,9 @@ def calculate_ci(logger, ci_method, modelB_values, modelA_values, total_days,
                                   use to calculate the
                                   average
                  randx          - 2D array of random numbers [0,1)
+                 ntests_chunk   - integer of the number of Monte Carlo
+                                  tests to compute at once, None to
+                                  compute all tests at once
 
              Returns:
                  intvl          - float of the confidence interval
@@ -360,73 +1494,272 @@ def calculate_ci(logger, ci_method, modelB_values, modelA_values, total_days,
         elif ndays < 20:
             intvl = 2.228*modelB_modelA_std/np.sqrt(ndays-1)
     elif ci_method == 'EMC_MONTE_CARLO':
-        ntest, ntests = 1, 10000
-        dates = []
-        for idx_val in modelB_values.index.values:
-            dates.append(idx_val[1])
-        ndays = len(dates)
-        rand1_data_index = pd.MultiIndex.from_product(
-            [['rand1'], np.arange(1, ntests+1, dtype=int), dates],
-            names=['model_plot_name', 'ntest', 'dates']
-        )
-        rand2_data_index = pd.MultiIndex.from_product(
-            [['rand2'], np.arange(1, ntests+1, dtype=int), dates],
-            names=['model_plot_name', 'ntest', 'dates']
-        )
-        rand1_data = pd.DataFrame(
-            np.nan, index=rand1_data_index,
-            columns=modelB_values.columns
-        )
-        rand2_data = pd.DataFrame(
-            np.nan, index=rand2_data_index,
-            columns=modelB_values.columns
-        )
-        ncolumns = len(modelB_values.columns)
-        rand1_data_values = np.empty([ntests, ndays, ncolumns])
-        rand2_data_values = np.empty([ntests, ndays, ncolumns])
-        randx_ge0_idx = np.where(randx - 0.5 >= 0)
-        randx_lt0_idx = np.where(randx - 0.5 < 0)
-        rand1_data_values[randx_ge0_idx[0], randx_ge0_idx[1],:] = (
-            modelA_values.iloc[randx_ge0_idx[1],:]
-        )
-        rand2_data_values[randx_ge0_idx[0], randx_ge0_idx[1],:] = (
-           modelB_values.iloc[randx_ge0_idx[1],:]
-        )
-        rand1_data_values[randx_lt0_idx[0], randx_lt0_idx[1],:] = (
-          modelB_values.iloc[randx_lt0_idx[1],:]
-        )
-        rand2_data_values[randx_lt0_idx[0], randx_lt0_idx[1],:] = (
-            modelA_values.iloc[randx_lt0_idx[1],:]
-        )
-        ntest = 1
-        while ntest <= ntests:
-            rand1_data.loc[('rand1', ntest)] = rand1_data_values[ntest-1,:,:]
-            rand2_data.loc[('rand2', ntest)] = rand2_data_values[ntest-1,:,:]
-            ntest+=1
-        intvl = np.nan
-        rand1_stat_values, rand1_stat_values_array, stat_plot_name = (
-            calculate_stat(logger, rand1_data, stat)
-        )
-        rand2_stat_values, rand2_stat_values_array, stat_plot_name = (
-            calculate_stat(logger, rand2_data, stat)
-        )
-        rand1_average_array = (
-            calculate_average(logger, average_method, stat, rand1_data,
-                              rand1_stat_values_array[0,:,:])
-        )
-        rand2_average_array = (
-            calculate_average(logger, average_method, stat, rand2_data,
-                              rand2_stat_values_array[0,:,:])
-        )
-        scores_diff = rand2_average_array- rand1_average_array
-        scores_diff_mean = np.sum(scores_diff)/ntests
-        scores_diff_var = np.sum((scores_diff-scores_diff_mean)**2)
-        scores_diff_std = np.sqrt(scores_diff_var/(ntests-1))
-        intvl = 1.96*scores_diff_std
+        intvl = calculate_monte_carlo_ci(logger, modelB_values,
+                                         modelA_values, stat,
+                                         average_method, randx,
+                                         ntests_chunk=ntests_chunk)
+    elif ci_method == 'BLOCK_BOOTSTRAP':
+        intvl = calculate_block_bootstrap_ci(logger, modelB_values,
+                                             modelA_values, stat,
+                                             average_method)
     else:
         logger.error("Invalid entry for MAKE_CI_METHOD, "
-                     +"use EMC, EMC_MONTE_CARLO")
+                     +"use EMC, EMC_MONTE_CARLO, BLOCK_BOOTSTRAP")
+        exit(1)
+    return intvl
+
+def calculate_ci_task(ci_task):
+    """! Calculate a confidence interval as a worker pool task
+
+             Args:
+                 ci_task - tuple of the logger name and the tuple
+                           of calculate_ci arguments after the
+                           logger
+
+             Returns:
+                 intvl   - float of the confidence interval
+    """
+    logger_name, ci_args = ci_task
+    try:
+        intvl = calculate_ci(logging.getLogger(logger_name), *ci_args)
+    except SystemExit:
+        # Exiting a pool worker would leave the pool waiting
+        raise RuntimeError("Could not calculate "+str(ci_args[0])
+                           +" confidence interval for "+str(ci_args[4]))
+    return intvl
+
+def calculate_ci_tasks(logger, ci_args_list, nproc=1):
+    """! Calculate confidence intervals for a list of calculate_ci
+         arguments, with a pool of worker processes if more than
+         one process is requested
+
+             Args:
+                 logger       - logging file
+                 ci_args_list - list of tuples of the calculate_ci
+                                arguments after the logger
+                 nproc        - integer of the number of worker
+                                processes
+
+             Returns:
+                 intvl_list   - list of the confidence intervals
+                                in the order of ci_args_list
+    """
+    if nproc > 1 and len(ci_args_list) > 1:
+        ci_tasks = [(logger.name, ci_args) for ci_args in ci_args_list]
+        pool = multiprocessing.Pool(min(nproc, len(ci_tasks)))
+        try:
+            intvl_list = pool.map(calculate_ci_task, ci_tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        intvl_list = [calculate_ci(logger, *ci_args)
+                      for ci_args in ci_args_list]
+    return intvl_list
+
+def get_block_bootstrap_counts(ndays, nresamples, block_length, seed):
+    """! Get the number of times each date is drawn in each
+         moving block bootstrap resample
+
+             Args:
+                 ndays        - integer of the number of dates
+                 nresamples   - integer of the number of resamples
+                 block_length - integer of the number of consecutive
+                                dates in each block
+                 seed         - integer of the random number
+                                generator seed
+
+             Returns:
+                 counts       - array of the number of times each
+                                date is drawn, number of resamples
+                                by number of dates
+    """
+    block_length = min(block_length, ndays)
+    nblocks = int(np.ceil(ndays/float(block_length)))
+    random_state = np.random.RandomState(seed)
+    block_starts = random_state.randint(0, ndays-block_length+1,
+                                        size=(nresamples, nblocks))
+    # Dates of the blocks laid end to end, trimmed to the
+    # number of dates
+    resample_dates = (
+        block_starts[:,:,None] + np.arange(block_length)
+    ).reshape(nresamples, nblocks*block_length)[:,:ndays]
+    resample_dates = (
+        resample_dates + ndays*np.arange(nresamples)[:,None]
+    )
+    counts = np.bincount(resample_dates.ravel(),
+                         minlength=nresamples*ndays)
+    counts = counts.reshape(nresamples, ndays).astype(float)
+    return counts
+
+def calculate_block_bootstrap_ci(logger, modelB_values, modelA_values,
+                                 stat, average_method, nresamples=5000,
+                                 block_length=None, seed=0):
+    """! Calculate the paired moving block bootstrap confidence
+         interval for the difference between the averages of two
+         sets of daily values. The same resampled dates are used
+         for every series, so all models and leads can be done in
+         one call.
+
+             Args:
+                 logger         - logging file
+                 modelB_values  - for MEAN, array of statistic values,
+                                  dates along the last axis; for
+                                  AGGREGATION, dictionary of the line
+                                  type column names and arrays of
+                                  their values, dates along the last
+                                  axis
+                 modelA_values  - like modelB_values, arrays
+                                  broadcastable to those of
+                                  modelB_values
+                 stat           - string of the statistic the
+                                  confidence intervals are being
+                                  calculated for, for fbar_obar the
+                                  forecast average of modelB_values
+                                  is compared to the observation
+                                  average of modelA_values
+                 average_method - string of the method to
+                                  use to calculate the
+                                  average, MEAN or AGGREGATION
+                 nresamples     - integer of the number of
+                                  bootstrap resamples
+                 block_length   - integer of the number of
+                                  consecutive dates in each block,
+                                  None to use the cube root of the
+                                  number of dates
+                 seed           - integer of the random number
+                                  generator seed
+
+             Returns:
+                 intvl          - float or masked array of the
+                                  confidence interval(s), shaped
+                                  like the leading axes
+    """
+    if average_method == 'MEAN':
+        modelB_modelA_diff = np.ma.masked_invalid(
+            np.ma.asarray(modelB_values) - np.ma.asarray(modelA_values)
+        )
+        valid = (~np.ma.getmaskarray(modelB_modelA_diff)).astype(float)
+    elif average_method == 'AGGREGATION':
+        columns = list(modelB_values.keys())
+        line_type = get_stat_line_type(logger, columns)
+        valid = np.ones(np.broadcast(*(
+            [modelB_values[column] for column in columns]
+            +[modelA_values[column] for column in columns]
+        )).shape)
+        for column in columns:
+            valid = (valid * np.isfinite(modelB_values[column])
+                     * np.isfinite(modelA_values[column]))
+    else:
+        logger.error("BLOCK_BOOTSTRAP confidence intervals can only be "
+                     +"calculated for MEAN or AGGREGATION averages, "
+                     +"not "+average_method)
         exit(1)
+    ndays = valid.shape[-1]
+    if block_length is None:
+        block_length = max(1, int(round(ndays**(1./3.))))
+    counts = get_block_bootstrap_counts(ndays, nresamples, block_length,
+                                        seed)
+    if average_method == 'MEAN':
+        # Resampled sums and numbers of valid dates,
+        # shape is [..., nresamples]
+        resample_sums = np.dot(modelB_modelA_diff.filled(0.), counts.T)
+        resample_nvalid = np.dot(valid, counts.T)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resample_averages_diff = np.ma.masked_invalid(
+                resample_sums/resample_nvalid
+            )
+    else:
+        # Aggregate the resampled partial sums like
+        # calculate_average_from_arrays, shape is [..., nresamples]
+        resample_averages = []
+        for model_values in [modelB_values, modelA_values]:
+            resample_partial_sums = aggregate_partial_sums(
+                line_type, model_values, date_counts=counts
+            )
+            with np.errstate(divide='ignore', invalid='ignore'):
+                resample_averages.append(
+                    calculate_stat_from_arrays(logger, line_type,
+                                               resample_partial_sums, stat)
+                )
+        if isinstance(resample_averages[0], tuple):
+            # forecast average of model B and observation
+            # average of model A
+            resample_averages = [resample_averages[0][0],
+                                 resample_averages[1][1]]
+        resample_averages_diff = np.ma.masked_invalid(
+            np.asarray(resample_averages[0], dtype=float)
+            - np.asarray(resample_averages[1], dtype=float)
+        )
+    intvl = 1.96*np.ma.std(resample_averages_diff, axis=-1, ddof=1)
+    intvl = np.ma.masked_where(valid.sum(axis=-1) < 2, intvl)
+    if intvl.ndim == 0:
+        intvl = intvl[()]
+    return intvl
+
+def calculate_monte_carlo_ci(logger, modelB_values, modelA_values, stat,
+                             average_method, randx, ntests_chunk=None):
+    """! Calculate the EMC Monte Carlo confidence interval for
+         the difference between two models. For each test the
+         daily partial sums of the two models are swapped where
+         the random number is less than 0.5, and the statistic
+         average is recomputed for both resampled series.
+
+             Args:
+                 logger         - logging file
+                 modelB_values  - dataframe of model B .stat columns,
+                                  one row per date
+                 modelA_values  - dataframe of model A .stat columns,
+                                  one row per date
+                 stat           - string of the statistic the
+                                  confidence intervals are being
+                                  calculated for
+                 average_method - string of the method to
+                                  use to calculate the
+                                  average
+                 randx          - 2D array of random numbers [0,1),
+                                  number of tests by number of dates
+                 ntests_chunk   - integer of the number of tests
+                                  to compute at once, None to
+                                  compute all tests at once
+
+             Returns:
+                 intvl          - float of the confidence interval
+    """
+    columns = modelB_values.columns.values.tolist()
+    line_type = get_stat_line_type(logger, columns)
+    modelB_partial_sums = modelB_values.values.astype(float)
+    modelA_partial_sums = modelA_values.values.astype(float)
+    ntests, ndays = randx.shape
+    if ntests_chunk is None:
+        ntests_chunk = ntests
+    scores_diff = np.ma.masked_all(ntests)
+    for chunk_beg in range(0, ntests, ntests_chunk):
+        chunk_end = min(chunk_beg+ntests_chunk, ntests)
+        # Swap the daily partial sums between the models where
+        # the random numbers are below 0.5, shape is
+        # [ntests, ndays, ncolumns]
+        randx_ge0 = (randx[chunk_beg:chunk_end,:] - 0.5 >= 0)[:,:,None]
+        rand1_partial_sums = np.where(randx_ge0, modelA_partial_sums,
+                                      modelB_partial_sums)
+        rand2_partial_sums = np.where(randx_ge0, modelB_partial_sums,
+                                      modelA_partial_sums)
+        rand_average_arrays = []
+        for rand_partial_sums in [rand1_partial_sums, rand2_partial_sums]:
+            # Put the dates along the last axis for each column
+            rand_average_array = calculate_average_from_arrays(
+                logger, average_method, line_type, stat,
+                dict(zip(columns,
+                         np.rollaxis(rand_partial_sums, -1)))
+            )
+            rand_average_arrays.append(rand_average_array)
+        scores_diff[chunk_beg:chunk_end] = (
+            rand_average_arrays[1] - rand_average_arrays[0]
+        )
+    scores_diff_mean = np.sum(scores_diff)/ntests
+    scores_diff_var = np.sum((scores_diff-scores_diff_mean)**2)
+    scores_diff_std = np.sqrt(scores_diff_var/(ntests-1))
+    intvl = 1.96*scores_diff_std
     return intvl
 
 def get_stat_plot_name(logger, stat):
@@ -487,6 +1820,275 @@ def get_stat_plot_name(logger, stat):
         exit(1)
     return stat_plot_name
 
+def get_stat_line_type(logger, columns):
+    """! Get the MET line type from the .stat columns
+ 
+             Args:
+                 logger  - logging file
+                 columns - list of the .stat column names
+
+             Returns:
+                 line_type - string of the line type, NULL
+                             if there is no data
+    """
+    if columns == [ "TOTAL" ]:
+        line_type = "NULL"
+    elif all(elem in columns for elem in ["FBAR", "OBAR", "MAE"]):
+        line_type = "SL1L2"
+    elif all(elem in columns for elem in ["FABAR", "OABAR", "MAE"]):
+        line_type = "SAL1L2"
+    elif all(elem in columns for elem in ["UFBAR", "VFBAR"]):
+        line_type = "VL1L2"
+    elif all(elem in columns for elem in ["UFABAR", "VFABAR"]):
+        line_type = "VAL1L2"
+    elif all(elem in columns for elem in ["VDIFF_SPEED", "VDIFF_DIR"]):
+        line_type = "VCNT"
+    elif all(elem in columns for elem in ['FY_OY', 'FN_ON']):
+        line_type = 'CTC'
+    else:
+        logger.error("Could not recognize line type from columns")
+        exit(1)
+    return line_type
+
+def get_sl1l2_terms(ps):
+    """! Get the terms shared by the SL1L2 statistic kernels
+ 
+             Args:
+                 ps - dictionary of the SL1L2 column names
+                      and arrays of their values
+
+             Returns:
+                 terms - dictionary of the term names
+                         and arrays of their values
+    """
+    terms = {}
+    terms['MSE'] = ps['FFBAR'] + ps['OOBAR'] - 2*ps['FOBAR']
+    terms['VAR_F'] = ps['FFBAR'] - ps['FBAR']*ps['FBAR']
+    terms['VAR_O'] = ps['OOBAR'] - ps['OBAR']*ps['OBAR']
+    terms['COVAR'] = ps['FOBAR'] - ps['FBAR']*ps['OBAR']
+    terms['PCOR'] = terms['COVAR']/np.sqrt(terms['VAR_F']*terms['VAR_O'])
+    return terms
+
+def get_vl1l2_terms(ps):
+    """! Get the terms shared by the VL1L2 statistic kernels
+ 
+             Args:
+                 ps - dictionary of the VL1L2 column names
+                      and arrays of their values
+
+             Returns:
+                 terms - dictionary of the term names
+                         and arrays of their values
+    """
+    terms = {}
+    terms['MSE'] = ps['UVFFBAR'] + ps['UVOOBAR'] - 2*ps['UVFOBAR']
+    terms['VAR_F'] = (ps['UVFFBAR'] - ps['UFBAR']*ps['UFBAR']
+                      - ps['VFBAR']*ps['VFBAR'])
+    terms['VAR_O'] = (ps['UVOOBAR'] - ps['UOBAR']*ps['UOBAR']
+                      - ps['VOBAR']*ps['VOBAR'])
+    terms['COVAR'] = (ps['UVFOBAR'] - ps['UFBAR']*ps['UOBAR']
+                      - ps['VFBAR']*ps['VOBAR'])
+    terms['PCOR'] = terms['COVAR']/np.sqrt(terms['VAR_F']*terms['VAR_O'])
+    return terms
+
+def calculate_ets(ps):
+    """! Calculate the equitable threat score from CTC counts
+ 
+             Args:
+                 ps - dictionary of the CTC column names
+                      and arrays of their values
+
+             Returns:
+                 ets - array of the equitable threat score
+    """
+    C = ((ps['FY_OY'] + ps['FY_ON'])*(ps['FY_OY'] + ps['FN_OY'])
+         /ps['TOTAL'])
+    ets = (ps['FY_OY'] - C)/(ps['FY_OY'] + ps['FY_ON'] + ps['FN_OY'] - C)
+    return ets
+
+# Statistic kernels by line type; terms are computed once per line
+# type and shared by all the kernels, kernels for statistics with
+# a forecast and observation value return both
+STAT_KERNEL_TERMS = {
+    'SL1L2': get_sl1l2_terms,
+    'VL1L2': get_vl1l2_terms,
+}
+STAT_KERNELS = {
+    'NULL': {
+        'fbar_obar': lambda ps: (ps['TOTAL'], ps['TOTAL']),
+    },
+    'SL1L2': {
+        'bias': lambda ps: ps['FBAR'] - ps['OBAR'],
+        'rmse': lambda ps: np.sqrt(ps['MSE']),
+        'msess': lambda ps: 1 - ps['MSE']/ps['VAR_O'],
+        'rsd': lambda ps: np.sqrt(ps['VAR_F'])/np.sqrt(ps['VAR_O']),
+        'rmse_md': lambda ps: np.sqrt((ps['FBAR'] - ps['OBAR'])**2),
+        'rmse_pv': lambda ps: np.sqrt(
+            ps['VAR_F'] + ps['VAR_O']
+            - 2*np.sqrt(ps['VAR_F']*ps['VAR_O'])*ps['PCOR']
+        ),
+        'pcor': lambda ps: ps['PCOR'],
+        'fbar': lambda ps: ps['FBAR'],
+        'fbar_obar': lambda ps: (ps['FBAR'], ps['OBAR']),
+    },
+    'SAL1L2': {
+        'acc': lambda ps: (
+            (ps['FOABAR'] - ps['FABAR']*ps['OABAR'])
+            /np.sqrt((ps['FFABAR'] - ps['FABAR']*ps['FABAR'])
+                     *(ps['OOABAR'] - ps['OABAR']*ps['OABAR']))
+        ),
+    },
+    'VL1L2': {
+        'bias': lambda ps: np.sqrt(ps['UVFFBAR']) - np.sqrt(ps['UVOOBAR']),
+        'rmse': lambda ps: np.sqrt(ps['MSE']),
+        'msess': lambda ps: 1 - ps['MSE']/ps['VAR_O'],
+        'rsd': lambda ps: np.sqrt(ps['VAR_F'])/np.sqrt(ps['VAR_O']),
+        'rmse_md': lambda ps: np.sqrt((ps['UFBAR'] - ps['UOBAR'])**2
+                                      + (ps['VFBAR'] - ps['VOBAR'])**2),
+        'rmse_pv': lambda ps: np.sqrt(
+            ps['VAR_F'] + ps['VAR_O']
+            - 2*np.sqrt(ps['VAR_F']*ps['VAR_O'])*ps['PCOR']
+        ),
+        'pcor': lambda ps: ps['PCOR'],
+        'fbar': lambda ps: np.sqrt(ps['UVFFBAR']),
+        'fbar_obar': lambda ps: (np.sqrt(ps['UVFFBAR']),
+                                 np.sqrt(ps['UVOOBAR'])),
+    },
+    'VAL1L2': {
+        'acc': lambda ps: ps['UVFOABAR']/np.sqrt(ps['UVFFABAR']
+                                                 *ps['UVOOABAR']),
+    },
+    'VCNT': {
+        'bias': lambda ps: ps['FBAR'] - ps['OBAR'],
+        'rsd': lambda ps: ps['FSTDEV']/ps['OSTDEV'],
+        'fbar': lambda ps: ps['FBAR'],
+        'fbar_obar': lambda ps: (ps['FBAR'], ps['OBAR']),
+        'speed_err': lambda ps: ps['SPEED_ERR'],
+        'dir_err': lambda ps: ps['DIR_ERR'],
+        'rmsve': lambda ps: ps['RMSVE'],
+        'vdiff_speed': lambda ps: ps['VDIFF_SPEED'],
+        'vdiff_dir': lambda ps: ps['VDIFF_DIR'],
+        'fbar_obar_speed': lambda ps: (ps['FBAR_SPEED'], ps['OBAR_SPEED']),
+        'fbar_obar_dir': lambda ps: (ps['FDIR'], ps['ODIR']),
+        'fbar_speed': lambda ps: ps['FBAR_SPEED'],
+        'fbar_dir': lambda ps: ps['FDIR'],
+    },
+    'CTC': {
+        'bias': lambda ps: (
+            (ps['FY_OY'] + ps['FY_ON'])/(ps['FY_OY'] + ps['FN_OY'])
+        ),
+        'ets': calculate_ets,
+    },
+}
+
+def calculate_stats_from_arrays(logger, line_type, partial_sums, stat_list):
+    """! Calculate multiple statistics from arrays of the MET .stat
+         file line type columns, sharing the common terms
+ 
+             Args:
+                 logger       - logging file
+                 line_type    - string of the line type
+                 partial_sums - dictionary of the line type column
+                                names and arrays of their values
+                 stat_list    - list of strings of the simple
+                                statistic names
+
+             Returns:
+                 stat_values_dict - dictionary of the statistic
+                                    names and arrays of their values,
+                                    a tuple of the forecast and
+                                    observation arrays for
+                                    statistics like fbar_obar
+    """
+    line_type_kernels = STAT_KERNELS.get(line_type, {})
+    ps = dict(partial_sums)
+    if line_type in STAT_KERNEL_TERMS:
+        ps.update(STAT_KERNEL_TERMS[line_type](partial_sums))
+    stat_values_dict = {}
+    for stat in stat_list:
+        if stat in line_type_kernels:
+            stat_values_dict[stat] = line_type_kernels[stat](ps)
+        elif line_type == "NULL":
+            stat_values_dict[stat] = ps['TOTAL']
+        else:
+            get_stat_plot_name(logger, stat)
+            logger.error(stat+" cannot be computed from line type "
+                         +line_type)
+            exit(1)
+    return stat_values_dict
+
+def calculate_stat_from_arrays(logger, line_type, partial_sums, stat):
+    """! Calculate the statistic from arrays of the MET .stat
+         file line type columns
+ 
+             Args:
+                 logger       - logging file
+                 line_type    - string of the line type
+                 partial_sums - dictionary of the line type column
+                                names and arrays of their values
+                 stat         - string of the simple statistic name
+
+             Returns:
+                 stat_values - array of the statistic values
+    """
+    stat_values = calculate_stats_from_arrays(logger, line_type,
+                                              partial_sums, [stat])[stat]
+    return stat_values
+
+def calculate_stats(logger, model_data, stat_list):
+    """! Calculate multiple statistics from the data from the
+         read in MET .stat file(s), extracting the line type
+         columns once
+ 
+             Args:
+                 logger     - logging file
+                 model_data - Dataframe containing the model(s)
+                              information from the MET .stat files
+                 stat_list  - list of strings of the simple
+                              statistic names being plotted
+
+             Returns:
+                 stat_dict - dictionary of the statistic names
+                             and tuples of the statistic values
+                             dataframe, the statistic values array,
+                             and the formal statistic name
+    """
+    model_data_columns = model_data.columns.values.tolist()
+    line_type = get_stat_line_type(logger, model_data_columns)
+    if line_type == "NULL":
+        logger.warning("Empty model_data dataframe..."
+                       +"setting line type to NULL")
+    partial_sums = dict(
+        (column, model_data[column].values.astype(float))
+        for column in model_data_columns
+    )
+    stat_values_dict = calculate_stats_from_arrays(logger, line_type,
+                                                   partial_sums, stat_list)
+    index_shape = [
+        len(model_data.index.get_level_values(level).unique())
+        for level in range(model_data.index.nlevels)
+    ]
+    stat_dict = {}
+    for stat in stat_list:
+        stat_plot_name = get_stat_plot_name(logger, stat)
+        stat_values_raw = stat_values_dict[stat]
+        if isinstance(stat_values_raw, tuple):
+            stat_values = pd.DataFrame(
+                np.column_stack(stat_values_raw), index=model_data.index,
+                columns=["FCST", "OBS"]
+            )
+            stat_values_array = np.ma.array([
+                np.ma.masked_invalid(values.reshape(index_shape))
+                for values in stat_values_raw
+            ])
+        else:
+            stat_values = pd.Series(stat_values_raw, index=model_data.index)
+            stat_values_array = np.ma.masked_invalid(
+                stat_values_raw.reshape(index_shape)
+            )
+        stat_dict[stat] = (stat_values, stat_values_array, stat_plot_name)
+    return stat_dict
+
 def calculate_stat(logger, model_data, stat):
     """! Calculate the statistic from the data from the
          read in MET .stat file(s)
@@ -503,325 +2105,7 @@ def calculate_stat(logger, model_data, stat):
                  stat_plot_name - string of the formal statistic
                                   name being plotted
     """
-    model_data_columns = model_data.columns.values.tolist()
-    if model_data_columns == [ "TOTAL" ]:
-        logger.warning("Empty model_data dataframe..."
-                       +"setting line type to NULL")
-        line_type = "NULL"
-        if stat == "fbar_obar":
-            stat_values = model_data.loc[:][["TOTAL"]]
-            stat_values_fbar = model_data.loc[:]["TOTAL"]
-            stat_values_obar = model_data.loc[:]["TOTAL"]
-        else:
-            stat_values = model_data.loc[:]["TOTAL"]
-    else:
-        if all(elem in model_data_columns for elem in ["FBAR", "OBAR", "MAE"]):
-            line_type = "SL1L2"
-            fbar = model_data.loc[:]["FBAR"]
-            obar = model_data.loc[:]["OBAR"]
-            fobar = model_data.loc[:]["FOBAR"]
-            ffbar = model_data.loc[:]["FFBAR"]
-            oobar = model_data.loc[:]["OOBAR"]
-        elif all(elem in model_data_columns for elem in ["FABAR", "OABAR", "MAE"]):
-            line_type = "SAL1L2"
-            fabar = model_data.loc[:]["FABAR"]
-            oabar = model_data.loc[:]["OABAR"]
-            foabar = model_data.loc[:]["FOABAR"]
-            ffabar = model_data.loc[:]["FFABAR"]
-            ooabar = model_data.loc[:]["OOABAR"]
-        elif all(elem in model_data_columns for elem in ["UFBAR", "VFBAR"]):
-            line_type = "VL1L2"
-            ufbar = model_data.loc[:]["UFBAR"]
-            vfbar = model_data.loc[:]["VFBAR"]
-            uobar = model_data.loc[:]["UOBAR"]
-            vobar = model_data.loc[:]["VOBAR"]
-            uvfobar = model_data.loc[:]["UVFOBAR"]
-            uvffbar = model_data.loc[:]["UVFFBAR"]
-            uvoobar = model_data.loc[:]["UVOOBAR"]
-        elif all(elem in model_data_columns for elem in ["UFABAR", "VFABAR"]):
-            line_type = "VAL1L2"
-            ufabar = model_data.loc[:]["UFABAR"]
-            vfabar = model_data.loc[:]["VFABAR"]
-            uoabar = model_data.loc[:]["UOABAR"]
-            voabar = model_data.loc[:]["VOABAR"]
-            uvfoabar = model_data.loc[:]["UVFOABAR"]
-            uvffabar = model_data.loc[:]["UVFFABAR"]
-            uvooabar = model_data.loc[:]["UVOOABAR"]
-        elif all(elem in model_data_columns for elem in ["VDIFF_SPEED", "VDIFF_DIR"]):
-            line_type = "VCNT"
-            fbar = model_data.loc[:]["FBAR"]
-            obar = model_data.loc[:]["OBAR"]
-            fs_rms = model_data.loc[:]["FS_RMS"]
-            os_rms = model_data.loc[:]["OS_RMS"]
-            msve = model_data.loc[:]["MSVE"]
-            rmsve = model_data.loc[:]["RMSVE"]
-            fstdev = model_data.loc[:]["FSTDEV"]
-            ostdev = model_data.loc[:]["OSTDEV"]
-            fdir = model_data.loc[:]["FDIR"]
-            odir = model_data.loc[:]["ODIR"]
-            fbar_speed = model_data.loc[:]["FBAR_SPEED"]
-            obar_speed = model_data.loc[:]["OBAR_SPEED"]
-            vdiff_speed = model_data.loc[:]["VDIFF_SPEED"]
-            vdiff_dir =  model_data.loc[:]["VDIFF_DIR"]
-            speed_err = model_data.loc[:]["SPEED_ERR"]
-            dir_err = model_data.loc[:]["DIR_ERR"]
-        elif all(elem in model_data_columns for elem in
-                 ['FY_OY', 'FN_ON']):
-            line_type = 'CTC'
-            total = model_data.loc[:]['TOTAL']
-            fy_oy = model_data.loc[:]['FY_OY']
-            fy_on = model_data.loc[:]['FY_ON']
-            fn_oy = model_data.loc[:]['FN_OY']
-            fn_on = model_data.loc[:]['FN_ON']
-        else:
-            logger.error("Could not recognize line type from columns")
-            exit(1)
-    if stat == "bias":
-        stat_plot_name = "Bias"
-        if line_type == "SL1L2":
-            stat_values = fbar - obar
-        elif line_type == "VL1L2":
-            stat_values = np.sqrt(uvffbar) - np.sqrt(uvoobar)
-        elif line_type == "VCNT":
-            stat_values = fbar - obar
-        elif line_type == "CTC":
-            stat_values = (fy_oy + fy_on)/(fy_oy + fn_oy)
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "rmse":
-        stat_plot_name = "Root Mean Square Error"
-        if line_type == "SL1L2":
-            stat_values = np.sqrt(ffbar + oobar - 2*fobar)
-        elif line_type == "VL1L2":
-            stat_values = np.sqrt(uvffbar + uvoobar - 2*uvfobar)
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "msess":
-        stat_plot_name = "Murphy's Mean Square Error Skill Score"
-        if line_type == "SL1L2":
-            mse = ffbar + oobar - 2*fobar
-            var_o = oobar - obar*obar
-            stat_values = 1 - mse/var_o
-        elif line_type == "VL1L2":
-            mse = uvffbar + uvoobar - 2*uvfobar
-            var_o = uvoobar - uobar*uobar - vobar*vobar 
-            stat_values = 1 - mse/var_o
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "rsd":
-        stat_plot_name = "Ratio of Standard Deviation"
-        if line_type == "SL1L2":
-            var_f = ffbar - fbar*fbar
-            var_o = oobar - obar*obar
-            stat_values = np.sqrt(var_f)/np.sqrt(var_o)
-        elif line_type == "VL1L2":
-            var_f = uvffbar - ufbar*ufbar - vfbar*vfbar
-            var_o = uvoobar - uobar*uobar - vobar*vobar
-            stat_values = np.sqrt(var_f)/np.sqrt(var_o)
-        elif line_type == "VCNT":
-            stat_values = fstdev/ostdev
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "rmse_md":
-        stat_plot_name = "Root Mean Square Error from Mean Error"
-        if line_type == "SL1L2":
-            stat_values = np.sqrt((fbar-obar)**2)
-        elif line_type == "VL1L2":
-            stat_values = np.sqrt((ufbar - uobar)**2 + (vfbar - vobar)**2)
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "rmse_pv":
-        stat_plot_name = "Root Mean Square Error from Pattern Variation"
-        if line_type == "SL1L2":
-            var_f = ffbar - fbar**2
-            var_o = oobar - obar**2
-            R = (fobar - (fbar*obar))/(np.sqrt(var_f*var_o))
-            stat_values = np.sqrt(var_f + var_o - 2*np.sqrt(var_f*var_o)*R)
-        elif line_type == "VL1L2":
-            var_f = uvffbar - ufbar*ufbar - vfbar*vfbar
-            var_o = uvoobar - uobar*uobar - vobar*vobar
-            R = (uvfobar - ufbar*uobar - vfbar*vobar)/(np.sqrt(var_f*var_o))
-            stat_values = np.sqrt(var_f + var_o - 2*np.sqrt(var_f*var_o)*R)
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "pcor":
-        stat_plot_name = "Pattern Correlation"
-        if line_type == "SL1L2":
-            var_f = ffbar - fbar*fbar
-            var_o = oobar - obar*obar
-            stat_values = (fobar - fbar*obar)/(np.sqrt(var_f*var_o))
-        elif line_type == "VL1L2":
-            var_f = uvffbar - ufbar*ufbar - vfbar*vfbar
-            var_o = uvoobar - uobar*uobar - vobar*vobar
-            stat_values = (uvfobar - ufbar*uobar - vfbar*vobar)/(np.sqrt(
-                              var_f*var_o))
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "acc":
-        stat_plot_name = "Anomaly Correlation Coefficient"
-        if line_type == "SAL1L2":
-            stat_values = \
-                (foabar - fabar*oabar)/(np.sqrt(
-                (ffabar - fabar*fabar)*(ooabar - oabar*oabar)))
-        elif line_type == "VAL1L2":
-            stat_values = (uvfoabar)/(np.sqrt(uvffabar*uvooabar))
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "fbar":
-        stat_plot_name = "Forecast Averages"
-        if line_type == "SL1L2":
-            stat_values = fbar
-        elif line_type == "VL1L2":
-            stat_values = np.sqrt(uvffbar)
-        elif line_type == "VCNT":
-            stat_values = fbar
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "fbar_obar":
-        stat_plot_name = "Average"
-        if line_type == "SL1L2":
-            stat_values = model_data.loc[:][["FBAR", "OBAR"]]
-            stat_values_fbar = model_data.loc[:]["FBAR"]
-            stat_values_obar = model_data.loc[:]["OBAR"]
-        elif line_type == "VL1L2":
-            stat_values = model_data.loc[:][["UVFFBAR", "UVOOBAR"]]
-            stat_values_fbar = np.sqrt(model_data.loc[:]["UVFFBAR"])
-            stat_values_obar = np.sqrt(model_data.loc[:]["UVOOBAR"])
-        elif line_type == "VCNT":
-            stat_values = model_data.loc[:][["FBAR", "OBAR"]]
-            stat_values_fbar = model_data.loc[:]["FBAR"]
-            stat_values_obar = model_data.loc[:]["OBAR"]
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "speed_err":
-        stat_plot_name = "Difference in Average FCST and "+ \
-                         "OBS Wind Vector Speeds"
-        if line_type == "VCNT":
-            stat_values = speed_err
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-            exit(1)
-    elif stat == "dir_err":
-        stat_plot_name = "Difference in Average FCST and "+ \
-                         "OBS Wind Vector Direction"
-        if line_type == "VCNT":
-           stat_values = dir_err
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "rmsve":
-        stat_plot_name = "Root Mean Square Difference Vector Error"
-        if line_type == "VCNT":
-           stat_values = rmsve
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-            exit(1)
-    elif stat == "vdiff_speed":
-        stat_plot_name = "Difference Vector Speed"
-        if line_type == "VCNT":
-            stat_values = vdiff_speed
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "vdiff_dir":
-        stat_plot_name = "Difference Vector Direction"
-        if line_type == "VCNT":
-           stat_values = vdiff_dir
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "fbar_obar_speed":
-        stat_plot_name = "Average Wind Vector Speed"
-        if line_type == "VCNT":
-            stat_values = model_data.loc[:][("FBAR_SPEED", "OBAR_SPEED")]
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "fbar_obar_dir":
-        stat_plot_name = "Average Wind Vector Direction"
-        if line_type == "VCNT":
-           stat_values = model_data.loc[:][("FDIR", "ODIR")]
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "fbar_speed":
-        stat_plot_name = "Average Forecast Wind Vector Speed"
-        if line_type == "VCNT":
-            stat_values = fbar_speed
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "fbar_dir":
-        stat_plot_name = "Average Forecast Wind Vector Direction"
-        if line_type == "VCNT":
-            stat_values = fdir
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    elif stat == "ets":
-        stat_plot_name = 'Equitable Threat Score'
-        if line_type == 'CTC':
-            C = ((fy_oy + fy_on)*(fy_oy + fn_oy))/total
-            stat_values = (fy_oy - C)/(fy_oy + fy_on+ fn_oy - C)
-        else:
-            logger.error(stat+" cannot be computed from line type "+line_type)
-    else:
-        logger.error(stat+" is not a valid option")
-        exit(1)
-    nindex = stat_values.index.nlevels
-    if stat == "fbar_obar":
-        if nindex == 1:
-            index0 = len(stat_values_fbar.index.get_level_values(0).unique())
-            stat_values_array_fbar = (
-                np.ma.masked_invalid(
-                    stat_values_fbar.values.reshape(index0)
-                )
-            )
-            index0 = len(stat_values_obar.index.get_level_values(0).unique())
-            stat_values_array_obar = (
-                np.ma.masked_invalid(
-                    stat_values_obar.values.reshape(index0)
-                )
-            )
-        elif nindex == 2:
-            index0 = len(stat_values_fbar.index.get_level_values(0).unique())
-            index1 = len(stat_values_fbar.index.get_level_values(1).unique())
-            stat_values_array_fbar = \
-                np.ma.masked_invalid(stat_values_fbar.values.reshape(
-                index0,index1))
-            index0 = len(stat_values_obar.index.get_level_values(0).unique())
-            index1 = len(stat_values_obar.index.get_level_values(1).unique())
-            stat_values_array_obar = \
-                np.ma.masked_invalid(stat_values_obar.values.reshape(
-                index0,index1))
-        elif nindex == 3:
-            index0 = len(stat_values_fbar.index.get_level_values(0).unique())
-            index1 = len(stat_values_fbar.index.get_level_values(1).unique())
-            index2 = len(stat_values_fbar.index.get_level_values(2).unique())
-            stat_values_array_fbar = \
-                np.ma.masked_invalid(stat_values_fbar.values.reshape(
-                index0,index1,index2))
-            index0 = len(stat_values_obar.index.get_level_values(0).unique())
-            index1 = len(stat_values_obar.index.get_level_values(1).unique())
-            index2 = len(stat_values_obar.index.get_level_values(2).unique())
-            stat_values_array_obar = \
-                np.ma.masked_invalid(stat_values_obar.values.reshape(
-                index0,index1,index2))
-        stat_values_array = np.ma.array([stat_values_array_fbar, 
-                                         stat_values_array_obar
-                                        ])
-    else:
-        if nindex == 1:
-            index0 = len(stat_values.index.get_level_values(0).unique())
-            stat_values_array = (
-                np.ma.masked_invalid(
-                    stat_values.values.reshape(index0)
-                )
-            )
-        elif nindex == 2:
-            index0 = len(stat_values.index.get_level_values(0).unique())
-            index1 = len(stat_values.index.get_level_values(1).unique())
-            stat_values_array = \
-                np.ma.masked_invalid(stat_values.values.reshape(
-                index0,index1))
-        elif nindex == 3:
-            index0 = len(stat_values.index.get_level_values(0).unique())
-            index1 = len(stat_values.index.get_level_values(1).unique())
-            index2 = len(stat_values.index.get_level_values(2).unique())
-            stat_values_array = \
-                np.ma.masked_invalid(stat_values.values.reshape(
-                index0,index1,index2))
+    stat_values, stat_values_array, stat_plot_name = (
+        calculate_stats(logger, model_data, [stat])[stat]
+    )
     return stat_values, stat_values_array, stat_plot_name
@@ -0,0 +1,138 @@
+'''
+Program Name: test_plot_batch.py
+Contact(s): Mallory Row
+Abstract: Smoke test of plot_batch.py, rendering a batch of
+          time series plots from small MET .stat files in a
+          separate Python process like make_plots_wrapper
+Usage: python -m unittest discover ush/plotting_scripts/tests
+'''
+
+from __future__ import (print_function, division)
+
+import os
+import sys
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+plotting_scripts_dir = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+try:
+    import matplotlib
+    import pandas
+    has_plotting_modules = True
+except ImportError:
+    has_plotting_modules = False
+
+
+def write_sl1l2_stat_file(stat_file, model, valid_dates):
+    """! Write a MET 8.1 .stat file with one SL1L2 line per date
+
+             Args:
+                 stat_file   - string of the .stat file to write
+                 model       - string of the model name
+                 valid_dates - list of the valid dates, formatted
+                               as "%Y%m%d"+"_"+"%H%M%S"
+
+             Returns:
+    """
+    with open(stat_file, 'w') as sf:
+        sf.write("VERSION MODEL DESC FCST_LEAD FCST_VALID_BEG "
+                 +"FCST_VALID_END OBS_LEAD OBS_VALID_BEG OBS_VALID_END "
+                 +"FCST_VAR FCST_UNITS FCST_LEV OBS_VAR OBS_UNITS OBS_LEV "
+                 +"OBTYPE VX_MASK INTERP_MTHD INTERP_PNTS FCST_THRESH "
+                 +"OBS_THRESH COV_THRESH ALPHA LINE_TYPE TOTAL FBAR OBAR "
+                 +"FOBAR FFBAR OOBAR MAE\n")
+        for date_num, valid_date in enumerate(valid_dates):
+            fbar = 5500. + date_num
+            obar = 5500. + 2*date_num
+            sf.write(' '.join(
+                ['V8.1', model, 'NA', '240000', valid_date, valid_date,
+                 '000000', valid_date, valid_date, 'HGT', 'NA', 'P500',
+                 'HGT', 'NA', 'P500', 'ANLYS', 'G002', 'NEAREST', '1',
+                 'NA', 'NA', 'NA', 'NA', 'SL1L2', '100', str(fbar),
+                 str(obar), str(fbar*obar), str(fbar*fbar),
+                 str(obar*obar), '1']
+            )+'\n')
+
+
+@unittest.skipIf(not has_plotting_modules,
+                 "matplotlib and pandas are needed to render plots")
+@unittest.skipIf(sys.version_info[0] > 2,
+                 "the plotting scripts run on Python 2")
+class PlotBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_plot_batch_renders_time_series(self):
+        stat_files_input_dir = os.path.join(self.tmp_dir, 'stat')
+        plotting_out_dir = os.path.join(self.tmp_dir, 'out')
+        plotting_out_dir_full = os.path.join(plotting_out_dir,
+                                             'grid2grid', 'anom')
+        os.makedirs(os.path.join(plotting_out_dir_full, 'imgs'))
+        os.makedirs(os.path.join(plotting_out_dir_full, 'data'))
+        valid_dates = ['2020010'+str(day)+'_000000' for day in range(1, 6)]
+        for model in ['gfs', 'ecm']:
+            stat_file_dir = os.path.join(
+                stat_files_input_dir, 'grid2grid', 'anom', model,
+                'valid20200101to20200105_valid000000to000000Z'
+                +'_init000000to000000Z'
+            )
+            os.makedirs(stat_file_dir)
+            write_sl1l2_stat_file(
+                os.path.join(stat_file_dir,
+                             model+'_f240000_fcstHGTP500_obsHGTP500'
+                             +'_interpNEAREST_regionG002.stat'),
+                model, valid_dates
+            )
+        plot_env = {
+            'VERIF_CASE': 'grid2grid', 'VERIF_TYPE': 'anom',
+            'PLOT_TIME': 'valid', 'START_DATE_YYYYmmdd': '20200101',
+            'END_DATE_YYYYmmdd': '20200105',
+            'VALID_TIME_INFO': '000000', 'INIT_TIME_INFO': '000000',
+            'FCST_VAR_NAME': 'HGT', 'FCST_VAR_EXTRA': 'None',
+            'FCST_VAR_LEVEL': 'P500', 'FCST_VAR_THRESH': 'None',
+            'OBS_VAR_NAME': 'HGT', 'OBS_VAR_EXTRA': 'None',
+            'OBS_VAR_LEVEL': 'P500', 'OBS_VAR_THRESH': 'None',
+            'INTERP': 'NEAREST', 'REGION': 'G002', 'LEAD': '240000',
+            'STAT_FILES_INPUT_DIR': stat_files_input_dir,
+            'PLOTTING_OUT_DIR': plotting_out_dir,
+            'PLOTTING_OUT_DIR_FULL': plotting_out_dir_full,
+            'PLOT_STATS_LIST': 'bias',
+            'MODEL_NAME_LIST': 'gfs ecm',
+            'MODEL_PLOT_NAME_LIST': 'gfs ecm',
+            'CI_METHOD': 'EMC', 'CI_NPROC': '1', 'VERIF_GRID': 'G002',
+            'EVENT_EQUALIZATION': 'False',
+            'LOGGING_FILENAME': os.path.join(self.tmp_dir, 'plot.log'),
+            'LOGGING_LEVEL': 'INFO', 'MET_VERSION': '8.1'
+        }
+        plot_batch_spec_file = os.path.join(self.tmp_dir, 'specs.json')
+        with open(plot_batch_spec_file, 'w') as spec_file:
+            json.dump(
+                [{'plotting_script': os.path.join(plotting_scripts_dir,
+                                                  'plot_time_series.py'),
+                  'env': plot_env}],
+                spec_file
+            )
+        returncode = subprocess.call(
+            [sys.executable,
+             os.path.join(plotting_scripts_dir, 'plot_batch.py'),
+             plot_batch_spec_file],
+            cwd=plotting_scripts_dir
+        )
+        self.assertEqual(returncode, 0)
+        self.assertTrue(os.path.exists(os.path.join(
+            plotting_out_dir_full, 'imgs',
+            'bias_valid00Z_HGT_P500_fhr240000_G002.png'
+        )))
+
+
+if __name__ == '__main__':
+    unittest.main()
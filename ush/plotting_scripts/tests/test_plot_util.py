@@ -0,0 +1,164 @@
+'''
+Program Name: test_plot_util.py
+Contact(s): Mallory Row
+Abstract: Checks the streaming PartialSumAggregator against the
+          AGGREGATION average of plot_util.calculate_average
+Usage: python -m unittest discover ush/plotting_scripts/tests
+'''
+
+from __future__ import (print_function, division)
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import plot_util as plot_util
+
+
+class PartialSumAggregatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger('test_plot_util')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.met_version = '8.1'
+        self.base_columns = plot_util.get_stat_file_base_columns(
+            self.met_version
+        )
+        self.sl1l2_columns = plot_util.get_stat_file_line_type_columns(
+            self.logger, self.met_version, 'SL1L2'
+        )
+        self.models = ['gfs', 'ecm']
+        self.valid_dates = ['2020010'+str(day)+'_000000'
+                            for day in range(1, 6)]
+        # SL1L2 rows by model and date, with a missing FBAR, a
+        # missing FFBAR on another date, and a missing date
+        random_state = np.random.RandomState(0)
+        self.sl1l2_rows = {}
+        for model in self.models:
+            for date_num, valid_date in enumerate(self.valid_dates):
+                if model == 'ecm' and date_num == 3:
+                    continue
+                total = random_state.randint(50, 150)
+                obs = 5500. + 50*random_state.randn(total)
+                fcst = obs + 2. + 10*random_state.randn(total)
+                row = {'TOTAL': float(total),
+                       'FBAR': fcst.mean(), 'OBAR': obs.mean(),
+                       'FOBAR': (fcst*obs).mean(),
+                       'FFBAR': (fcst*fcst).mean(),
+                       'OOBAR': (obs*obs).mean(),
+                       'MAE': np.abs(fcst-obs).mean()}
+                if model == 'gfs' and date_num == 1:
+                    row['FBAR'] = np.nan
+                if model == 'gfs' and date_num == 2:
+                    row['FFBAR'] = np.nan
+                self.sl1l2_rows[(model, valid_date)] = row
+        self.stat_file = os.path.join(self.tmp_dir, 'mixed.stat')
+        with open(self.stat_file, 'w') as sf:
+            sf.write(' '.join(self.base_columns)+'\n')
+            for (model, valid_date), row in sorted(self.sl1l2_rows.items()):
+                # VL1L2 rows have more columns than SL1L2 rows
+                sf.write(self.get_stat_file_row(
+                    model, valid_date, 'VL1L2', ['100']+['1.0']*9
+                ))
+                sf.write(self.get_stat_file_row(
+                    model, valid_date, 'SL1L2',
+                    ['NA' if np.isnan(row[column]) else repr(float(row[column]))
+                     for column in self.sl1l2_columns]
+                ))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def get_stat_file_row(self, model, valid_date, line_type,
+                          line_type_values):
+        return ' '.join(
+            ['V8.1', model, 'NA', '240000', valid_date, valid_date,
+             '000000', valid_date, valid_date, 'HGT', 'NA', 'P500', 'HGT',
+             'NA', 'P500', 'ANLYS', 'G002', 'NEAREST', '1', 'NA', 'NA',
+             'NA', 'NA', line_type]+line_type_values
+        )+'\n'
+
+    def get_model_dataframe(self):
+        model_dataframe = pd.DataFrame(
+            np.nan, columns=self.sl1l2_columns,
+            index=pd.MultiIndex.from_product(
+                [self.models, self.valid_dates],
+                names=['model_plot_name', 'dates']
+            )
+        )
+        for (model, valid_date), row in self.sl1l2_rows.items():
+            for column in self.sl1l2_columns:
+                model_dataframe.loc[(model, valid_date), column] = row[column]
+        return model_dataframe
+
+    def get_total_weighted_mean(self, model, column):
+        rows = [row for (row_model, valid_date), row
+                in self.sl1l2_rows.items()
+                if row_model == model and not np.isnan(row[column])]
+        return (sum(row[column]*row['TOTAL'] for row in rows)
+                /sum(row['TOTAL'] for row in rows))
+
+    def test_add_stat_file_names_columns_after_line_type_filter(self):
+        aggregator = plot_util.PartialSumAggregator(
+            self.logger, 'SL1L2', self.sl1l2_columns, ['MODEL']
+        )
+        aggregator.add_stat_file(self.stat_file, self.met_version,
+                                 chunksize=3)
+        self.assertEqual(aggregator.get_keys(), [('ecm',), ('gfs',)])
+        for model in self.models:
+            partial_sums = aggregator.get_partial_sums((model,))
+            for column in self.sl1l2_columns[1:]:
+                self.assertAlmostEqual(
+                    partial_sums[column],
+                    self.get_total_weighted_mean(model, column),
+                    places=6
+                )
+            self.assertEqual(
+                partial_sums['TOTAL'],
+                sum(row['TOTAL'] for (row_model, valid_date), row
+                    in self.sl1l2_rows.items() if row_model == model)
+            )
+
+    def test_matches_calculate_average_aggregation(self):
+        aggregator = plot_util.PartialSumAggregator(
+            self.logger, 'SL1L2', self.sl1l2_columns, ['MODEL']
+        )
+        aggregator.add_stat_file(self.stat_file, self.met_version,
+                                 chunksize=3)
+        model_dataframe = self.get_model_dataframe()
+        for stat in ['bias', 'rmse', 'pcor', 'fbar_obar']:
+            for model in self.models:
+                model_average = plot_util.calculate_average(
+                    self.logger, 'AGGREGATION', stat,
+                    model_dataframe.loc[[model]], None
+                )
+                partial_sums = dict(
+                    (column, model_dataframe.loc[[model]][column]
+                     .values.reshape(1, len(self.valid_dates)))
+                    for column in self.sl1l2_columns
+                )
+                model_average_from_arrays = (
+                    plot_util.calculate_average_from_arrays(
+                        self.logger, 'AGGREGATION', 'SL1L2', stat,
+                        partial_sums
+                    )
+                )
+                aggregator_stat = np.array(
+                    aggregator.calculate_stat((model,), stat)
+                ).reshape(np.shape(model_average))
+                np.testing.assert_allclose(model_average,
+                                           aggregator_stat, rtol=1e-6)
+                np.testing.assert_allclose(model_average,
+                                           model_average_from_arrays,
+                                           rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,54 +8,355 @@ Abstract: This script is run by all scripts in scripts/.
 '''
 
 import glob
-import subprocess
+import json
 import os
-import datetime
 import re
+import time
+import multiprocessing
 
-print("BEGIN: "+os.path.basename(__file__))
-
-# Read in environment variables
-DATA = os.environ['DATA']
-RUN = os.environ['RUN']
-verif_case_type = os.environ['verif_case_type']
-var_name = os.environ['var_name']
-fcst_var_name = os.environ['fcst_var_name']
-vx_mask = os.environ['vx_mask']
-
-# Get list of models and loop through
-env_var_model_list = []
-regex = re.compile(r'model(\d+)$')
-for key in os.environ.keys():
-    result = regex.match(key)
-    if result is not None:
-        env_var_model_list.append(result.group(0))
-for env_var_model in env_var_model_list:
-    model = os.environ[env_var_model]
-    # Get input and output data
+
+# Columns of the MET .stat file index keys, the columns
+# the files are pruned on
+STAT_FILE_INDEX_COLUMNS = ['MODEL', 'FCST_VAR', 'VX_MASK', 'LINE_TYPE']
+
+def get_stat_file_column_indices(header_line):
+    """! Get the indices of the index key columns from
+         the MET .stat file header line
+
+             Args:
+                 header_line    - string of the MET .stat file
+                                  header line
+
+             Returns:
+                 column_indices - dictionary of the column names
+                                  and their indices
+    """
+    header_columns = header_line.split()
+    column_indices = {}
+    for column in STAT_FILE_INDEX_COLUMNS:
+        column_indices[column] = header_columns.index(column)
+    return column_indices
+
+def build_stat_file_index(met_stat_file):
+    """! Build the index of a MET .stat file, recording for each
+         combination of MODEL, FCST_VAR, VX_MASK, and LINE_TYPE
+         the byte ranges of its runs of consecutive rows
+
+             Args:
+                 met_stat_file   - string of the MET .stat file
+                                   to index
+
+             Returns:
+                 stat_file_index - dictionary of the MET .stat
+                                   file modification time and size,
+                                   the header line length, and the
+                                   row ranges, a dictionary of the
+                                   space separated key column values
+                                   and a flat list of the start and
+                                   end byte offsets of their rows
+    """
+    met_stat_file_stat = os.stat(met_stat_file)
+    row_ranges = {}
+    with open(met_stat_file, 'rb') as msf:
+        header_line = msf.readline()
+        offset = len(header_line)
+        if header_line:
+            column_indices = get_stat_file_column_indices(
+                header_line.decode('utf-8', 'replace')
+            )
+            key_indices = [column_indices[column]
+                           for column in STAT_FILE_INDEX_COLUMNS]
+            ncolumns = max(key_indices) + 1
+            for line in msf:
+                line_columns = line.decode('utf-8', 'replace').split()
+                if len(line_columns) >= ncolumns:
+                    key = ' '.join([line_columns[i] for i in key_indices])
+                    key_row_ranges = row_ranges.setdefault(key, [])
+                    if (len(key_row_ranges) != 0
+                            and key_row_ranges[-1] == offset):
+                        key_row_ranges[-1]+=len(line)
+                    else:
+                        key_row_ranges.extend([offset, offset+len(line)])
+                offset+=len(line)
+    stat_file_index = {
+        'source_mtime': met_stat_file_stat.st_mtime,
+        'source_size': met_stat_file_stat.st_size,
+        'header_length': len(header_line),
+        'row_ranges': row_ranges
+    }
+    return stat_file_index
+
+def get_stat_file_index(met_stat_file, index_dir):
+    """! Get the index of a MET .stat file, reading it from the
+         index directory if it is current, otherwise building
+         and saving it
+
+             Args:
+                 met_stat_file   - string of the MET .stat file
+                 index_dir       - string of the directory of
+                                   the saved indices
+
+             Returns:
+                 stat_file_index - dictionary of the MET .stat
+                                   file index
+                 nbytes_indexed  - integer of the number of
+                                   bytes read to build the index,
+                                   0 if it was current
+    """
+    index_file = os.path.join(index_dir,
+                              os.path.basename(met_stat_file)+'.json')
+    met_stat_file_stat = os.stat(met_stat_file)
+    if os.path.exists(index_file):
+        try:
+            with open(index_file) as idxf:
+                stat_file_index = json.load(idxf)
+            if ('row_ranges' in stat_file_index
+                    and stat_file_index['source_mtime']
+                    == met_stat_file_stat.st_mtime
+                    and stat_file_index['source_size']
+                    == met_stat_file_stat.st_size):
+                return stat_file_index, 0
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+    stat_file_index = build_stat_file_index(met_stat_file)
+    met_stat_file_stat = os.stat(met_stat_file)
+    if (stat_file_index['source_mtime'] != met_stat_file_stat.st_mtime
+            or stat_file_index['source_size']
+            != met_stat_file_stat.st_size):
+        # Do not save the index of a file changed while indexing
+        return stat_file_index, stat_file_index['source_size']
+    tmp_index_file = index_file+'.'+str(os.getpid())+'.tmp'
+    try:
+        with open(tmp_index_file, 'w') as idxf:
+            json.dump(stat_file_index, idxf)
+        os.rename(tmp_index_file, index_file)
+    except (IOError, OSError) as e:
+        print("WARNING: Could not save index "+index_file+": "+str(e))
+        if os.path.exists(tmp_index_file):
+            os.remove(tmp_index_file)
+    return stat_file_index, stat_file_index['source_size']
+
+def prune_stat_file(met_stat_file, model, pruned_stat_file_dict,
+                    index_dir):
+    """! Prune a MET .stat file for one or more forecast variable
+         and verification mask combinations, seeking to the row
+         ranges in the file index that match on the MODEL,
+         FCST_VAR, VX_MASK, and LINE_TYPE columns; the pruned
+         files are written to temporary files and renamed when
+         complete
+
+             Args:
+                 met_stat_file         - string of the MET .stat
+                                         file to prune
+                 model                 - string of the model name
+                 pruned_stat_file_dict - dictionary of
+                                         (fcst_var_name, vx_mask)
+                                         tuples and the pruned
+                                         .stat file to write for
+                                         each
+                 index_dir             - string of the directory of
+                                         the saved .stat file indices
+
+             Returns:
+                 nbytes_read           - integer of the number of
+                                         bytes read
+                 nbytes_written        - integer of the number of
+                                         bytes written
+    """
+    stat_file_index, nbytes_read = get_stat_file_index(met_stat_file,
+                                                       index_dir)
+    # Row ranges to copy in file order, each the start and
+    # end byte offsets and the pruned .stat file key
+    prune_row_ranges = []
+    for key, key_row_ranges in stat_file_index['row_ranges'].items():
+        row_model, fcst_var, vx_mask, line_type = key.split(' ')
+        if row_model != model or line_type == 'VCNT':
+            continue
+        if (fcst_var, vx_mask) in pruned_stat_file_dict:
+            for i in range(0, len(key_row_ranges), 2):
+                prune_row_ranges.append((key_row_ranges[i],
+                                         key_row_ranges[i+1],
+                                         (fcst_var, vx_mask)))
+    prune_row_ranges.sort()
+    nbytes_written = 0
+    pruned_stat_files = {}
+    tmp_pruned_stat_file_dict = {}
+    for key, pruned_stat_file in pruned_stat_file_dict.items():
+        tmp_pruned_stat_file_dict[key] = (
+            pruned_stat_file+'.'+str(os.getpid())+'.tmp'
+        )
+    try:
+        for key, tmp_pruned_stat_file in tmp_pruned_stat_file_dict.items():
+            pruned_stat_files[key] = open(tmp_pruned_stat_file, 'wb')
+        with open(met_stat_file, 'rb') as msf:
+            header_line = msf.read(stat_file_index['header_length'])
+            nbytes_read+=len(header_line)
+            for pmsf in pruned_stat_files.values():
+                pmsf.write(header_line)
+                nbytes_written+=len(header_line)
+            for start, end, key in prune_row_ranges:
+                msf.seek(start)
+                rows = msf.read(end-start)
+                nbytes_read+=len(rows)
+                pruned_stat_files[key].write(rows)
+                nbytes_written+=len(rows)
+    except:
+        for pmsf in pruned_stat_files.values():
+            pmsf.close()
+        for tmp_pruned_stat_file in tmp_pruned_stat_file_dict.values():
+            if os.path.exists(tmp_pruned_stat_file):
+                os.remove(tmp_pruned_stat_file)
+        raise
+    for key, pmsf in pruned_stat_files.items():
+        pmsf.close()
+        os.rename(tmp_pruned_stat_file_dict[key], pruned_stat_file_dict[key])
+    return nbytes_read, nbytes_written
+
+def prune_stat_file_task(task):
+    """! Prune a MET .stat file as a worker pool task
+
+             Args:
+                 task           - tuple of the model name, the
+                                  MET .stat file, the pruned
+                                  .stat file dictionary, and the
+                                  index directory
+
+             Returns:
+                 model          - string of the model name
+                 nbytes_read    - integer of the number of
+                                  bytes read
+                 nbytes_written - integer of the number of
+                                  bytes written
+                 elapsed_time   - float of the seconds spent
+                                  pruning the file
+    """
+    model, met_stat_file, pruned_stat_file_dict, index_dir = task
+    start_time = time.time()
+    nbytes_read, nbytes_written = prune_stat_file(met_stat_file, model,
+                                                  pruned_stat_file_dict,
+                                                  index_dir)
+    elapsed_time = time.time() - start_time
+    return model, nbytes_read, nbytes_written, elapsed_time
+
+def get_model_prune_tasks(DATA, RUN, verif_case_type, model,
+                          prune_info_list):
+    """! Get the tasks to prune all of a model's MET .stat files
+         for one or more variable and verification mask
+         combinations
+
+             Args:
+                 DATA            - string of the working directory
+                 RUN             - string of the verification
+                                   step name
+                 verif_case_type - string of the verification
+                                   type
+                 model           - string of the model name
+                 prune_info_list - list of (var_name,
+                                   fcst_var_name, vx_mask)
+                                   tuples to prune for
+
+             Returns:
+                 prune_tasks     - list of tuples of the model
+                                   name, the MET .stat file, the
+                                   pruned .stat file dictionary,
+                                   and the index directory
+    """
     data_dir = os.path.join(DATA, RUN, 'data', model, verif_case_type)
     met_stat_files = glob.glob(os.path.join(data_dir, model+'_*'))
-    pruned_data_dir = os.path.join(DATA, RUN, 'data', model,
-                                   verif_case_type,
-                                   var_name+'_'+vx_mask)
-    if not os.path.exists(pruned_data_dir):
-       os.makedirs(pruned_data_dir)
-    print("Pruning "+data_dir+" for "+fcst_var_name+" and "+vx_mask)
-    # Prune the MET .stat files and write to new file
+    index_dir = os.path.join(data_dir, 'stat_file_index')
+    if not os.path.exists(index_dir):
+        try:
+            os.makedirs(index_dir)
+        except OSError:
+            if not os.path.isdir(index_dir):
+                raise
+    pruned_data_dir_dict = {}
+    for var_name, fcst_var_name, vx_mask in prune_info_list:
+        pruned_data_dir = os.path.join(data_dir, var_name+'_'+vx_mask)
+        if not os.path.exists(pruned_data_dir):
+            os.makedirs(pruned_data_dir)
+        pruned_data_dir_dict[(fcst_var_name, vx_mask)] = pruned_data_dir
+        print("Pruning "+data_dir+" for "+fcst_var_name+" and "+vx_mask)
+    prune_tasks = []
     for met_stat_file in met_stat_files:
         met_stat_filename = met_stat_file.rpartition('/')[2]
-        with open(met_stat_file) as msf:
-            first_line = msf.readline()
-        filter_cmd = (
-            ' | grep "'+vx_mask+'" | grep "'+fcst_var_name+'" | grep -v "VCNT"'
+        pruned_stat_file_dict = {}
+        for key, pruned_data_dir in pruned_data_dir_dict.items():
+            pruned_stat_file_dict[key] = os.path.join(pruned_data_dir,
+                                                      met_stat_filename)
+        prune_tasks.append((model, met_stat_file, pruned_stat_file_dict,
+                            index_dir))
+    return prune_tasks
+
+def run_prune_tasks(prune_tasks, nproc):
+    """! Run the MET .stat file pruning tasks, with a pool of
+         worker processes if more than one process is requested,
+         and print a summary for each model
+
+             Args:
+                 prune_tasks - list of tuples of the model name,
+                               the MET .stat file, the pruned
+                               .stat file dictionary, and the
+                               index directory
+                 nproc       - integer of the number of worker
+                               processes
+    """
+    if nproc > 1 and len(prune_tasks) > 1:
+        pool = multiprocessing.Pool(min(nproc, len(prune_tasks)))
+        try:
+            task_results = pool.map(prune_stat_file_task, prune_tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        task_results = [prune_stat_file_task(task) for task in prune_tasks]
+    model_summary_dict = {}
+    for model, nbytes_read, nbytes_written, elapsed_time in task_results:
+        if model not in model_summary_dict:
+            model_summary_dict[model] = [0, 0, 0, 0.0]
+        model_summary = model_summary_dict[model]
+        model_summary[0]+=1
+        model_summary[1]+=nbytes_read
+        model_summary[2]+=nbytes_written
+        model_summary[3]+=elapsed_time
+    for model in sorted(model_summary_dict.keys()):
+        nfiles, nbytes_read, nbytes_written, elapsed_time = (
+            model_summary_dict[model]
+        )
+        print("Pruned "+str(nfiles)+" files for "+model+": "
+              +str(nbytes_read)+" bytes read, "
+              +str(nbytes_written)+" bytes written, "
+              +"%.2f" % elapsed_time+" seconds")
+
+if __name__ == '__main__':
+    print("BEGIN: "+os.path.basename(__file__))
+    start_time = time.time()
+
+    # Read in environment variables
+    DATA = os.environ['DATA']
+    RUN = os.environ['RUN']
+    verif_case_type = os.environ['verif_case_type']
+    var_name = os.environ['var_name']
+    fcst_var_name = os.environ['fcst_var_name']
+    vx_mask = os.environ['vx_mask']
+    nproc = int(os.environ.get('prune_nproc',
+                               os.environ.get('nproc', '1')))
+
+    # Get list of models and their pruning tasks
+    env_var_model_list = []
+    regex = re.compile(r'model(\d+)$')
+    for key in os.environ.keys():
+        result = regex.match(key)
+        if result is not None:
+            env_var_model_list.append(result.group(0))
+    prune_tasks = []
+    for env_var_model in env_var_model_list:
+        model = os.environ[env_var_model]
+        prune_tasks.extend(
+            get_model_prune_tasks(DATA, RUN, verif_case_type, model,
+                                  [(var_name, fcst_var_name, vx_mask)])
         )
-        ps = subprocess.Popen('grep -R "'+model+'" '+met_stat_file+filter_cmd,
-                              shell=True, stdout=subprocess.PIPE,
-                              stderr=subprocess.STDOUT)
-        output = ps.communicate()[0]
-        pruned_met_stat_file = os.path.join(pruned_data_dir,
-                                            met_stat_filename)
-        with open(pruned_met_stat_file, 'w') as pmsf:
-            pmsf.write(first_line+output)
-
-print("END: "+os.path.basename(__file__))
+    run_prune_tasks(prune_tasks, nproc)
+
+    print("Pruning took "+"%.2f" % (time.time() - start_time)+" seconds")
+    print("END: "+os.path.basename(__file__))